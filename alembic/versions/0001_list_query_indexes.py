@@ -0,0 +1,42 @@
+"""Índices compostos para as consultas de listagem
+
+As tabelas são criadas por Base.metadata.create_all no startup; bancos novos já
+nascem com estes índices. Esta migração cria os índices em bancos existentes
+(IF NOT EXISTS), com CREATE INDEX CONCURRENTLY no PostgreSQL para não bloquear
+escritas em log_events.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_log_events_created_at_id", "log_events", ["created_at", "id"]),
+    ("ix_log_events_user_id_created_at", "log_events", ["user_id", "created_at", "id"]),
+    ("ix_log_events_event_type_created_at", "log_events", ["event_type", "created_at", "id"]),
+    ("ix_messages_created_at_id", "messages", ["created_at", "id"]),
+    ("ix_messages_user_id_created_at", "messages", ["user_id", "created_at", "id"]),
+    ("ix_messages_status_created_at", "messages", ["status", "created_at", "id"]),
+    ("ix_benefits_user_id", "benefits", ["user_id", "id"]),
+    ("ix_benefits_category_status", "benefits", ["category", "status", "id"]),
+    ("ix_benefits_status", "benefits", ["status", "id"]),
+]
+
+
+def upgrade():
+    # CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
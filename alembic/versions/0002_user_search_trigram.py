@@ -0,0 +1,42 @@
+"""Busca de usuários com pg_trgm + unaccent
+
+Cria as extensões, a função f_unaccent (IMMUTABLE, para poder ser indexada) e
+um índice GIN de trigramas sobre nome, email e username normalizados. A
+expressão do índice é a mesma de app.crud.user_search.pg_search_document.
+Só se aplica ao PostgreSQL; no SQLite a busca usa FTS5 criado no startup.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text"
+        " LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS"
+        " $func$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $func$"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_search_trgm ON users"
+            " USING gin (f_unaccent(lower(name || ' ' || email || ' ' || username)) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_search_trgm")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
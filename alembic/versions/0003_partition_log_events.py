@@ -0,0 +1,133 @@
+"""Particionamento mensal de log_events (PostgreSQL)
+
+Converte log_events em tabela particionada por RANGE (created_at), com uma
+partição por mês (log_events_pAAAAMM) e uma partição DEFAULT. Consultas com
+intervalo de datas só leem as partições do intervalo, e a retenção
+(app.core.log_retention) remove meses inteiros com DETACH + DROP.
+
+A tabela atual é renomeada para log_events_legacy, os dados são copiados e a
+antiga é removida, tudo na mesma transação: log_events fica bloqueada durante
+a cópia, então rode em janela de manutenção em bases grandes. A sequence de
+id é reaproveitada, então os ids continuam de onde estavam.
+
+A chave primária passa a ser (id, created_at), exigência do PostgreSQL para
+tabelas particionadas. Só se aplica ao PostgreSQL.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_log_events_created_at_id", ["created_at", "id"]),
+    ("ix_log_events_user_id_created_at", ["user_id", "created_at", "id"]),
+    ("ix_log_events_event_type_created_at", ["event_type", "created_at", "id"]),
+]
+
+# Partições criadas à frente do mês atual (o startup mantém esta janela)
+MONTHS_AHEAD = 2
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _drop_indexes():
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS ix_log_events_id")
+
+
+def _create_indexes():
+    op.execute("CREATE INDEX ix_log_events_id ON log_events (id)")
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON log_events ({', '.join(columns)})")
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    already = bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('log_events'))"
+    )).scalar()
+    if already:
+        return
+
+    # A sequence deixa de pertencer à tabela antiga para não ser removida com ela
+    op.execute("ALTER SEQUENCE log_events_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE log_events RENAME TO log_events_legacy")
+    op.execute("ALTER TABLE log_events_legacy RENAME CONSTRAINT log_events_pkey TO log_events_legacy_pkey")
+    _drop_indexes()
+
+    op.execute(
+        "CREATE TABLE log_events ("
+        " id INTEGER NOT NULL DEFAULT nextval('log_events_id_seq'),"
+        " user_id INTEGER REFERENCES users (id),"
+        " event_type VARCHAR NOT NULL,"
+        " description VARCHAR NOT NULL,"
+        " created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,"
+        " CONSTRAINT log_events_pkey PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    )
+
+    oldest = bind.execute(sa.text("SELECT MIN(created_at) FROM log_events_legacy")).scalar()
+    now = datetime.utcnow()
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE log_events_p{month:%Y%m} PARTITION OF log_events"
+            f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE log_events_default PARTITION OF log_events DEFAULT")
+
+    # Índices na tabela pai são criados em todas as partições
+    _create_indexes()
+
+    op.execute(
+        "INSERT INTO log_events (id, user_id, event_type, description, created_at)"
+        " SELECT id, user_id, event_type, description, created_at FROM log_events_legacy"
+    )
+    op.execute("DROP TABLE log_events_legacy")
+    op.execute("ALTER SEQUENCE log_events_id_seq OWNED BY log_events.id")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER SEQUENCE log_events_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE log_events RENAME TO log_events_partitioned")
+    op.execute("ALTER TABLE log_events_partitioned RENAME CONSTRAINT log_events_pkey TO log_events_partitioned_pkey")
+    _drop_indexes()
+
+    op.execute(
+        "CREATE TABLE log_events ("
+        " id INTEGER NOT NULL DEFAULT nextval('log_events_id_seq'),"
+        " user_id INTEGER REFERENCES users (id),"
+        " event_type VARCHAR NOT NULL,"
+        " description VARCHAR NOT NULL,"
+        " created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,"
+        " CONSTRAINT log_events_pkey PRIMARY KEY (id)"
+        ")"
+    )
+    op.execute(
+        "INSERT INTO log_events (id, user_id, event_type, description, created_at)"
+        " SELECT id, user_id, event_type, description, created_at FROM log_events_partitioned"
+    )
+    _create_indexes()
+    # Remove a tabela pai junto com todas as partições
+    op.execute("DROP TABLE log_events_partitioned")
+    op.execute("ALTER SEQUENCE log_events_id_seq OWNED BY log_events.id")
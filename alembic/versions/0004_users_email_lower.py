@@ -0,0 +1,31 @@
+"""Índice em lower(email) de users
+
+O cadastro (UserCRUD.get_conflict) e a importação em massa
+(UserCRUD.bulk_create) comparam o email sem diferenciar maiúsculas; este
+índice de expressão evita varrer users nessa verificação. CONCURRENTLY no
+PostgreSQL para não bloquear escritas.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower", "users", [sa.text("lower(email)")],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_email_lower", table_name="users", if_exists=True, postgresql_concurrently=True)
@@ -1,20 +1,49 @@
-from typing import Generator, List
-from fastapi import Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import DBSession, get_db
 from app.core.security import decode_access_token
-from app.crud.user import user_crud
-from app.models.user import User
+from app.core.cache import UserSnapshot, user_cache
+from app.crud.user import async_user_crud
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Obtém usuário atual através do token JWT"""
+    db: DBSession = Depends(get_db)
+) -> UserSnapshot:
+    """
+    Obtém usuário atual através do token JWT
+
+    Retorna um UserSnapshot (id, nome, papel, ativo) vindo do user_cache;
+    o banco só é consultado quando a entrada não está no cache.
+    """
+    return await _user_from_token(token, db)
+
+
+async def get_current_user_sse(
+    request: Request,
+    token: Optional[str] = Query(None),
+    db: DBSession = Depends(get_db)
+) -> UserSnapshot:
+    """
+    Como get_current_user, mas aceita o token também em ?token=, pois o
+    EventSource do navegador não envia o header Authorization
+    """
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _user_from_token(token, db)
+
+
+async def _user_from_token(token: str, db: DBSession) -> UserSnapshot:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
@@ -29,9 +58,13 @@ def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = user_crud.get_by_id(db, user_id=int(user_id))
+    user = await user_cache.aget(int(user_id))
     if user is None:
-        raise credentials_exception
+        db_user = await async_user_crud.get_by_id(db, user_id=int(user_id))
+        if db_user is None:
+            raise credentials_exception
+        user = UserSnapshot.from_user(db_user)
+        await user_cache.aset(user)
     
     if not user.is_active:
         raise HTTPException(
@@ -44,7 +77,7 @@ def get_current_user(
 
 def require_role(allowed_roles: List[str]):
     """Dependency factory para verificar papel do usuário"""
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: UserSnapshot = Depends(get_current_user)) -> UserSnapshot:
         if current_user.role.value not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -52,4 +85,3 @@ def require_role(allowed_roles: List[str]):
             )
         return current_user
     return role_checker
-
@@ -0,0 +1,138 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.query_stats import QueryStats, current_stats, end_request_stats, start_request_stats
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "Requisições HTTP por rota, método e status",
+    labelnames=("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP",
+    labelnames=("method", "route"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    labelnames=("method", "route"),
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Consultas SQL por requisição",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+db_query_seconds_per_request = Histogram(
+    "db_query_seconds_per_request",
+    "Tempo total em consultas SQL por requisição",
+    labelnames=("method", "route"),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Template da rota (ex.: /api/users/{user_id}) para usar como label"""
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    # Caminhos sem rota agrupados num único label (evita explosão de séries)
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra, por template de rota: total de requisições,
+    latência, requisições em andamento e consultas SQL (quantidade e tempo)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats, token = start_request_stats()
+        http_requests_in_progress.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            end_request_stats(token, f"{method} {route}")
+            http_requests_in_progress.dec(method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            db_queries_per_request.observe(stats.count, method=method, route=route)
+            db_query_seconds_per_request.observe(stats.duration, method=method, route=route)
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """Valor do header Server-Timing: tempo em SQL (com a quantidade) e tempo total"""
+    return f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} consultas", app;dur={elapsed * 1000:.1f}'
+
+
+class QueryProfilerMiddleware:
+    """
+    Perfil das consultas SQL por requisição (opcional, QUERY_PROFILER=true).
+
+    Liga o registro por forma de consulta no QueryStats da requisição,
+    adiciona o header Server-Timing (visível no DevTools do navegador) e
+    imprime uma linha por requisição, mais uma por consulta repetida
+    repeat_threshold vezes ou mais (provável N+1). Só conta o que rodou
+    antes do início da resposta no header; a linha de log conta tudo.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 3):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Normalmente o MetricsMiddleware (mais externo) já abriu o QueryStats
+        stats = current_stats()
+        token = None
+        if stats is None:
+            stats, token = start_request_stats()
+        stats.profile = True
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            if token is not None:
+                end_request_stats(token)
+            print(
+                f"[sql] {scope['method']} {scope['path']} {status_code}: {stats.count} consultas, "
+                f"{stats.duration * 1000:.1f}ms em SQL de {elapsed * 1000:.1f}ms"
+            )
+            for shape, count, duration in stats.repeated(self.repeat_threshold):
+                print(f"[sql]   {count}x ({duration * 1000:.1f}ms) possível N+1: {shape[:300]}")
@@ -1,43 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import verify_password, create_access_token
-from app.crud.user import user_crud
-from app.crud.log_event import log_event_crud
+from sqlalchemy.exc import IntegrityError
+from app.core.database import DBSession, get_db
+from app.core.security import averify_and_update_password, aget_password_hash, create_access_token
+from app.crud.user import async_user_crud
+from app.core.audit import audit_log
 from app.schemas.user import UserCreate, UserResponse, UserLogin, TokenResponse, DadosBancarios
 from app.api.deps import get_current_user
-from app.models.user import User
+from app.schemas.serializers import user_to_response
+from app.core.cache import UserSnapshot
+from app.core.responses import json_response
 
 router = APIRouter()
 
 
-def user_to_response(user: User) -> dict:
-    """Converte User model para formato de resposta da API"""
-    return {
-        "id": user.id,
-        "nome": user.name,
-        "email": user.email,
-        "username": user.username,
-        "cpf": user.cpf,
-        "papel": user.role.value,
-        "telefone": user.phone,
-        "status": "ATIVO" if user.is_active else "INATIVO",
-        "dadosBancarios": {
-            "banco": user.bank_name or "",
-            "agencia": user.bank_agency or "",
-            "conta": user.bank_account or ""
-        }
-    }
-
-
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Endpoint de login - retorna JWT token"""
     # Buscar usuário por username ou email
-    user = user_crud.get_by_username_or_email(db, credentials.username)
+    user = await async_user_crud.get_by_username_or_email(db, credentials.username)
     
     if not user:
         raise HTTPException(
@@ -45,12 +28,17 @@ def login(
             detail=f"Usuário '{credentials.username}' não encontrado"
         )
     
-    if not verify_password(credentials.senha, user.password_hash):
+    password_ok, new_hash = await averify_and_update_password(credentials.senha, user.password_hash)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Senha incorreta"
         )
     
+    # Hash gerado com BCRYPT_ROUNDS antigo: regravar com o custo atual
+    if new_hash:
+        await async_user_crud.update_password_hash(db, user, new_hash)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -62,14 +50,12 @@ def login(
     
     # Registrar log de login
     # ⚠️ VULNERABILIDADE PARCIAL: Falta IP, geolocalização, user agent
-    try:
-        log_event_crud.create(db, {
-            "user_id": user.id,
-            "event_type": "LOGIN",
-            "description": "Login realizado"  # Sem IP, device info
-        })
-    except:
-        pass  # Não falhar login se log falhar
+    # (enfileirado; gravado em lote em background, nunca falha o login)
+    await audit_log.arecord(
+        user_id=user.id,
+        event_type="LOGIN",
+        description="Login realizado"  # Sem IP, device info
+    )
     
     return {
         "access_token": access_token,
@@ -79,48 +65,58 @@ def login(
 
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Endpoint de registro - cria novo usuário com papel COLABORADOR"""
-    # Verificar se email já existe
-    existing_user = user_crud.get_by_email(db, user_data.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email já cadastrado"
-        )
-    
-    # Verificar se username já existe
-    existing_user = user_crud.get_by_username(db, user_data.username)
-    if existing_user:
+    # Email e username verificados numa única consulta, antes do hash (caro)
+    conflict = await async_user_crud.get_conflict(db, user_data.email, user_data.username)
+    if conflict:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username já cadastrado"
+            detail=conflict
         )
     
     # Criar usuário (sempre com papel COLABORADOR no registro)
     user_dict = user_data.model_dump()
     user_dict["papel"] = "COLABORADOR"  # Forçar papel COLABORADOR
+    # Hash calculado aqui, fora do event loop, em vez de dentro do CRUD
+    user_dict["password_hash"] = await aget_password_hash(user_dict.pop("senha"))
     
-    user = user_crud.create(db, user_dict)
+    try:
+        user = await async_user_crud.create(db, user_dict)
+    except IntegrityError:
+        # Cadastro concorrente entre a verificação e o INSERT (constraint UNIQUE)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email ou username já cadastrado"
+        )
     
     return user_to_response(user)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+async def get_current_user_info(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """Retorna informações do usuário autenticado"""
-    return user_to_response(current_user)
+    # current_user é só o snapshot do cache; os dados completos vêm do banco
+    user = await async_user_crud.get_by_id(db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+    
+    return json_response(user_to_response(user))
 
 
 @router.post("/logout")
-def logout(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def logout(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """
     Endpoint de logout
@@ -133,14 +129,11 @@ def logout(
     """
     # Registrar log de logout
     # ⚠️ VULNERABILIDADE: Falta IP, motivo (manual vs timeout vs forçado)
-    try:
-        log_event_crud.create(db, {
-            "user_id": current_user.id,
-            "event_type": "LOGOUT",
-            "description": "Logout realizado"  # Muito genérico
-        })
-    except:
-        pass  # Não falhar logout se log falhar
+    await audit_log.arecord(
+        user_id=current_user.id,
+        event_type="LOGOUT",
+        description="Logout realizado"  # Muito genérico
+    )
     
     # ⚠️ VULNERABILIDADE: Token NÃO é invalidado aqui
     # Em um sistema seguro, o token deveria ser adicionado a uma blacklist
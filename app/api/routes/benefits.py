@@ -1,55 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
-from app.core.database import get_db
-from app.crud.benefit import benefit_crud
-from app.schemas.benefit import BenefitResponse
+from app.core.database import DBSession, get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.etag import conditional_response, weak_etag
+from app.core.responses import json_response
+from app.crud.benefit import async_benefit_crud
+from app.core.audit import audit_log
+from app.schemas.benefit import BenefitResponse, BenefitBulkAssign, BenefitBulkStatusUpdate, BenefitBulkResult
+from app.schemas.serializers import benefit_to_response
 from app.api.deps import get_current_user, require_role
-from app.models.user import User
+from app.core.cache import UserSnapshot
 
 router = APIRouter()
 
 
-def benefit_to_response(benefit) -> dict:
-    """Converte Benefit model para formato de resposta da API"""
-    return {
-        "id": benefit.id,
-        "userId": benefit.user_id,
-        "nome": benefit.name,
-        "categoria": benefit.category,
-        "status": benefit.status,
-        "valor": benefit.value or "",
-        "descricao": benefit.description or ""
-    }
-
-
 @router.get("", response_model=List[BenefitResponse])
-def list_benefits(
+async def list_benefits(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     user_id: Optional[int] = None,
     category: Optional[str] = None,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """
     Lista benefícios
     - Se COLABORADOR: retorna apenas seus próprios benefícios
     - Se GESTOR_RH ou ADMIN: pode filtrar por user_id ou ver todos
+    - Paginação por skip/limit ou por cursor (header X-Next-Cursor)
+    - ETag: com If-None-Match igual, responde 304 sem corpo
     """
     # Se o usuário é COLABORADOR, forçar filtro pelo seu próprio ID
     if current_user.role.value == "COLABORADOR":
         user_id = current_user.id
     
-    benefits = benefit_crud.get_multi(
+    try:
+        benefits = await async_benefit_crud.get_multi(
+            db,
+            skip=skip,
+            limit=limit,
+            user_id=user_id,
+            category=category,
+            status=status,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor inválido"
+        )
+    
+    cursor_header = next_cursor(benefits, limit)
+    
+    # benefits não tem updated_at: a ETag usa as colunas da resposta
+    etag = weak_etag([
+        (b.id, b.user_id, b.name, b.category, b.status, b.value, b.description)
+        for b in benefits
+    ])
+    not_modified = conditional_response(
+        request, response, etag,
+        {NEXT_CURSOR_HEADER: cursor_header} if cursor_header else None
+    )
+    if not_modified:
+        return not_modified
+    
+    return json_response([benefit_to_response(benefit) for benefit in benefits], response)
+
+
+@router.post("/bulk", response_model=BenefitBulkResult)
+async def bulk_assign_benefit(
+    data: BenefitBulkAssign,
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
+):
+    """
+    Concede um benefício a vários usuários de uma vez (apenas GESTOR_RH ou ADMIN)
+    - Filtros: papel, userIds e apenasAtivos
+    - ignorarExistentes: não duplica para quem já tem benefício com o mesmo nome
+    """
+    created = await async_benefit_crud.bulk_assign(
         db,
-        skip=skip,
-        limit=limit,
-        user_id=user_id,
-        category=category,
-        status=status
+        data.model_dump(),
+        role=data.papel,
+        user_ids=data.userIds,
+        only_active=data.apenasAtivos,
+        skip_existing=data.ignorarExistentes
+    )
+    
+    # Um único evento de auditoria para a operação inteira
+    audit_log.record(
+        user_id=current_user.id,
+        event_type="BULK_ASSIGN_BENEFIT",
+        description=f"Benefício {data.nome} ({data.categoria}) concedido a {created} usuários",
+        db=db
     )
     
-    return [benefit_to_response(benefit) for benefit in benefits]
+    return {"afetados": created}
+
 
+@router.patch("/status", response_model=BenefitBulkResult)
+async def bulk_update_benefit_status(
+    data: BenefitBulkStatusUpdate,
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
+):
+    """
+    Altera o status de vários benefícios de uma vez (apenas GESTOR_RH ou ADMIN)
+    - Ao menos um filtro (categoria, nome ou userIds) é obrigatório
+    """
+    if not (data.categoria or data.nome or data.userIds):
+        raise HTTPException(
+            status_code=400,
+            detail="Informe ao menos um filtro: categoria, nome ou userIds"
+        )
+    
+    updated = await async_benefit_crud.bulk_update_status(
+        db,
+        data.status,
+        category=data.categoria,
+        name=data.nome,
+        user_ids=data.userIds
+    )
+    
+    filters = ", ".join(
+        f"{label}={value}"
+        for label, value in (("categoria", data.categoria), ("nome", data.nome), ("userIds", data.userIds))
+        if value
+    )
+    audit_log.record(
+        user_id=current_user.id,
+        event_type="BULK_UPDATE_BENEFIT_STATUS",
+        description=f"{updated} benefícios alterados para {data.status} ({filters})",
+        db=db
+    )
+    
+    return {"afetados": updated}
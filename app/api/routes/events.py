@@ -0,0 +1,52 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import event_broker
+from app.api.deps import get_current_user_sse
+from app.core.cache import UserSnapshot
+
+router = APIRouter()
+
+
+async def event_stream(user_id: int, request: Request):
+    """
+    Eventos do usuário no formato SSE, com ping periódico para manter a conexão
+
+    Encerra quando o cliente desconecta, o que libera a inscrição no broker;
+    sem essa checagem o envio para um socket fechado pode ser ignorado em
+    silêncio pelo servidor e a conexão ficaria inscrita para sempre.
+    """
+    async with event_broker.subscribe(user_id) as queue:
+        # Reconexão automática do EventSource após 5s
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['tipo']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user_sse)
+):
+    """
+    Canal de eventos do usuário autenticado (Server-Sent Events)
+    - MESSAGE_CREATED / MESSAGE_STATUS: mensagem criada ou com status alterado
+    - Token no header Authorization ou em ?token= (EventSource)
+    - A conexão não segura sessão do banco enquanto aguarda eventos
+    """
+    return StreamingResponse(
+        event_stream(current_user.id, request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desliga o buffer de proxies (nginx) para o evento sair na hora
+            "X-Accel-Buffering": "no",
+        }
+    )
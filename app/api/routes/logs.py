@@ -1,72 +1,115 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
-from app.core.database import get_db
-from app.crud.log_event import log_event_crud
-from app.crud.user import user_crud
+from app.core.database import DBSession, get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.responses import json_response
+from app.core.audit import audit_log
+from app.crud.log_event import async_log_event_crud
+from app.crud.log_export import EXPORT_FORMATS, log_exporter
 from app.schemas.log_event import LogEventResponse
+from app.schemas.serializers import log_to_response
 from app.api.deps import require_role
-from app.models.user import User
+from app.core.cache import UserSnapshot
 
 router = APIRouter()
 
 
-def log_to_response(log, db: Session) -> dict:
-    """Converte LogEvent model para formato de resposta da API"""
-    usuario_nome = ""
-    if log.user_id:
-        user = user_crud.get_by_id(db, log.user_id)
-        if user:
-            usuario_nome = user.name
-    
-    return {
-        "id": log.id,
-        "dataHora": log.created_at.isoformat(),
-        "usuario": usuario_nome,
-        "userId": log.user_id,  # Retorna None se não houver user_id
-        "tipoEvento": log.event_type,
-        "descricao": log.description
-    }
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Converte string de data (ISO) para datetime; inválida é ignorada"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
 
 
 @router.get("", response_model=List[LogEventResponse])
-def list_logs(
+async def list_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     user_id: Optional[int] = None,
     event_type: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: User = Depends(require_role(["GESTOR_RH", "ADMIN"])),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
-    """Lista logs de eventos (apenas GESTOR_RH ou ADMIN)"""
+    """
+    Lista logs de eventos (apenas GESTOR_RH ou ADMIN)
+    - Paginação por skip/limit ou por cursor: o header X-Next-Cursor traz o
+      cursor da próxima página (ausente na última)
+    """
     # Converter strings de data para datetime se fornecidas
-    start_datetime = None
-    end_datetime = None
+    start_datetime = parse_date(start_date)
+    end_datetime = parse_date(end_date)
+    
+    try:
+        logs = await async_log_event_crud.get_multi(
+            db,
+            skip=skip,
+            limit=limit,
+            user_id=user_id,
+            event_type=event_type,
+            start_date=start_datetime,
+            end_date=end_datetime,
+            with_user=True,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
     
-    if start_date:
-        try:
-            start_datetime = datetime.fromisoformat(start_date)
-        except:
-            pass
+    cursor_header = next_cursor(logs, limit, with_timestamp=True)
+    if cursor_header:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_header
+    
+    return json_response([log_to_response(log) for log in logs], response)
+
+
+@router.get("/export")
+async def export_logs(
+    formato: str = Query("csv", description="csv ou ndjson"),
+    user_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+):
+    """
+    Exporta todos os logs filtrados em CSV ou NDJSON (apenas GESTOR_RH ou ADMIN)
+    - Mesmos filtros de GET /api/logs, sem limite de linhas
+    - Resposta enviada em streaming, em ordem cronológica
+    """
+    media_type = EXPORT_FORMATS.get(formato)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido. Deve ser um de: {', '.join(EXPORT_FORMATS)}"
+        )
     
-    if end_date:
-        try:
-            end_datetime = datetime.fromisoformat(end_date)
-        except:
-            pass
+    await audit_log.arecord(
+        user_id=current_user.id,
+        event_type="EXPORT_LOGS",
+        description=f"Exportação de logs ({formato}): user_id={user_id}, event_type={event_type}, "
+                    f"start_date={start_date}, end_date={end_date}"
+    )
     
-    logs = log_event_crud.get_multi(
-        db,
-        skip=skip,
-        limit=limit,
+    rows = log_exporter.stream(
+        formato,
         user_id=user_id,
         event_type=event_type,
-        start_date=start_datetime,
-        end_date=end_datetime
+        start_date=parse_date(start_date),
+        end_date=parse_date(end_date)
+    )
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="logs.{formato}"'}
     )
-    
-    return [log_to_response(log, db) for log in logs]
-
@@ -1,90 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
-from app.core.database import get_db
-from app.crud.message import message_crud
-from app.crud.log_event import log_event_crud
+from app.core.database import DBSession, get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.etag import conditional_response, weak_etag
+from app.core.responses import json_response
+from app.crud.message import async_message_crud
+from app.core.audit import audit_log
 from app.schemas.message import MessageCreate, MessageUpdate, MessageResponse
+from app.schemas.serializers import message_to_response
 from app.api.deps import get_current_user, require_role
-from app.models.user import User
+from app.core.cache import UserSnapshot
 
 router = APIRouter()
 
 
-def message_to_response(message) -> dict:
-    """Converte Message model para formato de resposta da API"""
-    return {
-        "id": message.id,
-        "userId": message.user_id,
-        "titulo": message.title,
-        "conteudo": message.content,
-        "status": message.status,
-        "dataHora": message.created_at.isoformat()
-    }
-
-
 @router.get("", response_model=List[MessageResponse])
-def list_messages(
+async def list_messages(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     user_id: Optional[int] = None,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """
     Lista mensagens
     - Se COLABORADOR: retorna apenas suas próprias mensagens
     - Se GESTOR_RH ou ADMIN: pode filtrar por user_id ou ver todas
+    - Paginação por skip/limit ou por cursor (header X-Next-Cursor)
+    - ETag: com If-None-Match igual, responde 304 sem corpo
     """
     # Se o usuário é COLABORADOR, forçar filtro pelo seu próprio ID
     if current_user.role.value == "COLABORADOR":
         user_id = current_user.id
     
-    messages = message_crud.get_multi(
-        db,
-        skip=skip,
-        limit=limit,
-        user_id=user_id,
-        status=status
+    try:
+        messages = await async_message_crud.get_multi(
+            db,
+            skip=skip,
+            limit=limit,
+            user_id=user_id,
+            status=status,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor inválido"
+        )
+    
+    cursor_header = next_cursor(messages, limit, with_timestamp=True)
+    
+    # Só status muda numa mensagem (e atualiza updated_at)
+    etag = weak_etag([(msg.id, msg.status, msg.updated_at) for msg in messages])
+    not_modified = conditional_response(
+        request, response, etag,
+        {NEXT_CURSOR_HEADER: cursor_header} if cursor_header else None
     )
+    if not_modified:
+        return not_modified
     
-    return [message_to_response(msg) for msg in messages]
+    return json_response([message_to_response(msg) for msg in messages], response)
 
 
 @router.post("", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-def create_message(
+async def create_message(
     message_data: MessageCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """Cria nova mensagem do usuário autenticado para o RH"""
     # Criar mensagem
-    message = message_crud.create(db, message_data.model_dump(), current_user.id)
+    message = await async_message_crud.create(db, message_data.model_dump(), current_user.id)
     
-    # Registrar log
+    # Registrar log (na mesma transação da mensagem)
     # ⚠️ Log razoável, mas poderia ter mais info (IP, destinatário)
-    try:
-        log_event_crud.create(db, {
-            "user_id": current_user.id,
-            "event_type": "NEW_MESSAGE",
-            "description": f"Mensagem enviada: {message.title}"
-        })
-    except:
-        pass
+    audit_log.record(
+        user_id=current_user.id,
+        event_type="NEW_MESSAGE",
+        description=f"Mensagem enviada: {message.title}",
+        db=db
+    )
     
     return message_to_response(message)
 
 
 @router.patch("/{message_id}", response_model=MessageResponse)
-def update_message_status(
+async def update_message_status(
     message_id: int,
     message_data: MessageUpdate,
-    current_user: User = Depends(require_role(["GESTOR_RH", "ADMIN"])),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
     """Atualiza status da mensagem (apenas GESTOR_RH ou ADMIN)"""
-    message = message_crud.update_status(db, message_id, message_data.status)
+    message = await async_message_crud.update_status(db, message_id, message_data.status)
     
     if not message:
         raise HTTPException(
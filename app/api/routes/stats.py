@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from app.core.database import DBSession, get_db
+from app.core.cache import UserSnapshot, stats_cache
+from app.crud.stats import async_stats_crud
+from app.core.responses import json_response
+from app.schemas.stats import StatsResponse
+from app.api.deps import require_role
+
+router = APIRouter()
+
+
+@router.get("", response_model=StatsResponse)
+async def get_stats(
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
+):
+    """
+    Resumo para o dashboard de RH (apenas GESTOR_RH ou ADMIN)
+    - Mensagens por status, benefícios ativos por categoria, usuários ativos por papel
+    - Servido do cache por até STATS_CACHE_TTL_SECONDS; escritas invalidam o cache
+    """
+    summary = await stats_cache.aget()
+    if summary is None:
+        summary = await async_stats_crud.get_summary(db)
+        await stats_cache.aset(summary)
+    
+    return json_response(summary)
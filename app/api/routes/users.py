@@ -1,54 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
 from typing import List, Optional
-from app.core.database import get_db
-from app.crud.user import user_crud
-from app.crud.benefit import benefit_crud
-from app.crud.log_event import log_event_crud
-from app.schemas.user import UserResponse, UserUpdate, UserRoleUpdate
+from app.core.database import DBSession, get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.etag import conditional_response, weak_etag
+from app.core.responses import json_response
+from app.crud.user import async_user_crud
+from app.crud.benefit import async_benefit_crud
+from app.crud.user_import import IMPORT_FORMATS, ImportFileError, detect_format, user_importer
+from app.core.audit import audit_log
+from app.schemas.user import UserResponse, UserUpdate, UserRoleUpdate, UserStatusUpdate, UserImportResult
 from app.schemas.benefit import BenefitResponse
+from app.schemas.serializers import benefit_to_response, user_to_response
 from app.api.deps import get_current_user, require_role
-from app.models.user import User
+from app.core.cache import UserSnapshot
 
 router = APIRouter()
 
 
-def user_to_response(user: User) -> dict:
-    """Converte User model para formato de resposta da API"""
-    return {
-        "id": user.id,
-        "nome": user.name,
-        "email": user.email,
-        "username": user.username,
-        "cpf": user.cpf,
-        "papel": user.role.value,
-        "telefone": user.phone,
-        "status": "ATIVO" if user.is_active else "INATIVO",
-        "dadosBancarios": {
-            "banco": user.bank_name or "",
-            "agencia": user.bank_agency or "",
-            "conta": user.bank_account or ""
-        }
-    }
-
-
 @router.get("/me", response_model=UserResponse)
-def get_my_info(
-    current_user: User = Depends(get_current_user)
+async def get_my_info(
+    request: Request,
+    response: Response,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
-    """Retorna informações do usuário autenticado"""
-    return user_to_response(current_user)
+    """Retorna informações do usuário autenticado (com ETag; 304 se não mudou)"""
+    # current_user é só o snapshot do cache; os dados completos vêm do banco
+    user = await async_user_crud.get_by_id(db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+    
+    not_modified = conditional_response(request, response, weak_etag(user.id, user.updated_at))
+    if not_modified:
+        return not_modified
+    
+    return json_response(user_to_response(user), response)
 
 
 @router.put("/me", response_model=UserResponse)
-def update_my_info(
+async def update_my_info(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: DBSession = Depends(get_db)
 ):
     """Atualiza dados do usuário autenticado"""
     # Atualizar usuário
-    updated_user = user_crud.update(db, current_user.id, user_data.model_dump(exclude_unset=True))
+    updated_user = await async_user_crud.update(db, current_user.id, user_data.model_dump(exclude_unset=True))
     
     if not updated_user:
         raise HTTPException(
@@ -59,49 +59,100 @@ def update_my_info(
     # Registrar log de atualização
     # ⚠️ VULNERABILIDADE (TC-AUDIT-001): Log genérico, sem detalhes
     # Falta: quais campos alterados, valores antigos/novos, IP origem
-    try:
-        log_event_crud.create(db, {
-            "user_id": current_user.id,
-            "event_type": "UPDATE_DATA",
-            "description": "Dados atualizados"  # Muito genérico!
-        })
-    except:
-        pass
+    audit_log.record(
+        user_id=current_user.id,
+        event_type="UPDATE_DATA",
+        description="Dados atualizados",  # Muito genérico!
+        db=db
+    )
     
     return user_to_response(updated_user)
 
 
 @router.get("", response_model=List[UserResponse])
-def list_users(
+async def list_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(require_role(["GESTOR_RH", "ADMIN"])),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
-    """Lista usuários (apenas GESTOR_RH ou ADMIN)"""
-    users = user_crud.get_multi(
-        db, 
-        skip=skip, 
-        limit=limit,
-        role=role,
-        is_active=is_active,
-        search=search
+    """Lista usuários (apenas GESTOR_RH ou ADMIN; paginação por skip/limit ou cursor)"""
+    try:
+        users = await async_user_crud.get_multi(
+            db, 
+            skip=skip, 
+            limit=limit,
+            role=role,
+            is_active=is_active,
+            search=search,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    
+    # Busca é ordenada por relevância, não por id: sem cursor
+    cursor_header = None if search else next_cursor(users, limit)
+    if cursor_header:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_header
+    
+    return json_response([user_to_response(user) for user in users], response)
+
+
+@router.post("/import", response_model=UserImportResult)
+async def import_users(
+    file: UploadFile = File(...),
+    formato: Optional[str] = Query(None, description="csv ou jsonl (padrão: pela extensão do arquivo)"),
+    current_user: UserSnapshot = Depends(require_role(["ADMIN"])),
+    db: DBSession = Depends(get_db)
+):
+    """Importa usuários em massa de um arquivo CSV ou JSONL (apenas ADMIN)"""
+    fmt = (formato or detect_format(file.filename) or "").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido. Deve ser um de: {', '.join(IMPORT_FORMATS)}"
+        )
+    
+    try:
+        result = await user_importer.arun(db, file.file, fmt)
+    except ImportFileError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Um único evento de auditoria com o resumo da importação
+    audit_log.record(
+        user_id=current_user.id,
+        event_type="IMPORT_USERS",
+        description=(
+            f"Importação de usuários ({file.filename}): {result['importados']} importados, "
+            f"{result['erros']} erros de {result['total']} linhas"
+        ),
+        db=db
     )
     
-    return [user_to_response(user) for user in users]
+    return result
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
+    request: Request,
+    response: Response,
     user_id: int,
-    current_user: User = Depends(require_role(["GESTOR_RH", "ADMIN"])),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
-    """Obtém detalhes de um usuário específico (apenas GESTOR_RH ou ADMIN)"""
-    user = user_crud.get_by_id(db, user_id)
+    """Obtém detalhes de um usuário específico (apenas GESTOR_RH ou ADMIN; com ETag)"""
+    user = await async_user_crud.get_by_id(db, user_id)
     
     if not user:
         raise HTTPException(
@@ -109,15 +160,19 @@ def get_user(
             detail="Usuário não encontrado"
         )
     
-    return user_to_response(user)
+    not_modified = conditional_response(request, response, weak_etag(user.id, user.updated_at))
+    if not_modified:
+        return not_modified
+    
+    return json_response(user_to_response(user), response)
 
 
 @router.patch("/{user_id}/role", response_model=UserResponse)
-def update_user_role(
+async def update_user_role(
     user_id: int,
     role_data: UserRoleUpdate,
-    current_user: User = Depends(require_role(["ADMIN"])),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(require_role(["ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
     """Atualiza papel de um usuário (apenas ADMIN)"""
     # Validar papel
@@ -128,7 +183,7 @@ def update_user_role(
             detail=f"Papel inválido. Deve ser um de: {', '.join(valid_roles)}"
         )
     
-    user = user_crud.get_by_id(db, user_id)
+    user = await async_user_crud.get_by_id(db, user_id)
     
     if not user:
         raise HTTPException(
@@ -137,50 +192,74 @@ def update_user_role(
         )
     
     old_role = user.role.value
-    updated_user = user_crud.update_role(db, user_id, role_data.papel)
+    updated_user = await async_user_crud.update_role(db, user, role_data.papel)
     
     # Registrar log de mudança de papel
     # ⚠️ VULNERABILIDADE PARCIAL: Log tem info, mas falta IP, justificativa
-    try:
-        log_event_crud.create(db, {
-            "user_id": user_id,
-            "event_type": "CHANGE_ROLE",
-            "description": f"Papel alterado de {old_role} para {role_data.papel}"
-            # Falta: quem alterou, IP origem, justificativa
-        })
-    except:
-        pass
+    audit_log.record(
+        user_id=user_id,
+        event_type="CHANGE_ROLE",
+        description=f"Papel alterado de {old_role} para {role_data.papel}",
+        # Falta: quem alterou, IP origem, justificativa
+        db=db
+    )
+    
+    return user_to_response(updated_user)
+
+
+@router.patch("/{user_id}/status", response_model=UserResponse)
+async def update_user_status(
+    user_id: int,
+    status_data: UserStatusUpdate,
+    current_user: UserSnapshot = Depends(require_role(["ADMIN"])),
+    db: DBSession = Depends(get_db)
+):
+    """
+    Ativa ou desativa um usuário (apenas ADMIN)
+    - Usuário inativo não faz login e seus tokens deixam de valer na hora
+      (a entrada do user_cache é invalidada no commit)
+    """
+    valid_statuses = ["ATIVO", "INATIVO"]
+    if status_data.status not in valid_statuses:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Status inválido. Deve ser um de: {', '.join(valid_statuses)}"
+        )
+    
+    updated_user = await async_user_crud.set_active(db, user_id, status_data.status == "ATIVO")
+    
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+    
+    audit_log.record(
+        user_id=user_id,
+        event_type="CHANGE_STATUS",
+        description=f"Status alterado para {status_data.status}",
+        db=db
+    )
     
     return user_to_response(updated_user)
 
 
 @router.get("/{user_id}/benefits", response_model=List[BenefitResponse])
-def get_user_benefits(
+async def get_user_benefits(
     user_id: int,
-    current_user: User = Depends(require_role(["GESTOR_RH", "ADMIN"])),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(require_role(["GESTOR_RH", "ADMIN"])),
+    db: DBSession = Depends(get_db)
 ):
     """Lista benefícios de um usuário específico (apenas GESTOR_RH ou ADMIN)"""
     # Verificar se o usuário existe
-    user = user_crud.get_by_id(db, user_id)
+    user = await async_user_crud.get_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuário não encontrado"
         )
     
-    benefits = benefit_crud.get_by_user_id(db, user_id)
-    
-    return [
-        {
-            "id": benefit.id,
-            "userId": benefit.user_id,
-            "nome": benefit.name,
-            "categoria": benefit.category,
-            "status": benefit.status,
-            "valor": benefit.value or "",
-            "descricao": benefit.description or ""
-        }
-        for benefit in benefits
-    ]
+    benefits = await async_benefit_crud.get_by_user_id(db, user_id)
+    
+    return json_response([benefit_to_response(benefit) for benefit in benefits])
 
@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import DBSession, SessionLocal, after_commit
+from app.core.metrics import Counter, Gauge
+from app.models.log_event import LogEvent
+
+audit_events_total = Counter(
+    "audit_events_total",
+    "Eventos de auditoria por resultado (enqueued, written, dropped, failed)",
+    labelnames=("result",),
+)
+
+
+class AuditLogWriter:
+    """
+    Gravação assíncrona e em lote dos eventos de auditoria (log_events).
+
+    record() apenas enfileira o evento (fila limitada) e retorna; uma thread
+    de fundo grava os eventos com um INSERT multi-linha quando o lote atinge
+    batch_size ou a cada flush_interval segundos. Com a fila cheia, record()
+    espera até enqueue_timeout e então descarta o evento (contado em
+    audit_events_total{result="dropped"}). stop() grava o que restou na fila;
+    eventos registrados depois dele são descartados (a thread não é
+    reiniciada durante o shutdown).
+
+    Rotas async usam arecord(), que só espera pela fila no threadpool, nunca
+    no event loop.
+
+    Com db (a sessão da requisição), record() grava o evento na mesma
+    transação da escrita que ele descreve: os dois são confirmados juntos no
+    commit do get_db, ou nenhum dos dois.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def start(self) -> None:
+        """Inicia a thread de gravação (idempotente)"""
+        with self._lock:
+            self._stopped = False
+            self._start_thread()
+
+    def _ensure_started(self) -> bool:
+        """Inicia a thread se preciso; False se o writer já foi parado (stop)"""
+        with self._lock:
+            if self._stopped:
+                return False
+            self._start_thread()
+            return True
+
+    def _start_thread(self) -> None:
+        # Chamado com self._lock
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Grava os eventos pendentes e encerra a thread"""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+    def record(
+        self,
+        event_type: str,
+        description: str,
+        user_id: Optional[int] = None,
+        db: Optional[DBSession] = None,
+    ) -> bool:
+        """Enfileira um evento (ou o adiciona à transação de db); retorna False se ele foi descartado (fila cheia)"""
+        event = self._event(event_type, description, user_id)
+        if db is not None:
+            self._add_to_session(db, event)
+            return True
+        return self._enqueue(event, self.enqueue_timeout)
+
+    async def arecord(
+        self,
+        event_type: str,
+        description: str,
+        user_id: Optional[int] = None,
+        db: Optional[DBSession] = None,
+    ) -> bool:
+        """Como record(), para rotas async: com a fila cheia, a espera acontece no threadpool"""
+        event = self._event(event_type, description, user_id)
+        if db is not None:
+            self._add_to_session(db, event)
+            return True
+        try:
+            return self._enqueue(event, None)
+        except queue.Full:
+            return await run_in_threadpool(self._enqueue, event, self.enqueue_timeout)
+
+    @staticmethod
+    def _event(event_type: str, description: str, user_id: Optional[int]) -> dict:
+        return {
+            "user_id": user_id,
+            "event_type": event_type,
+            "description": description,
+            # Horário do evento, não do flush
+            "created_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _add_to_session(db: DBSession, event: dict) -> None:
+        db.add(LogEvent(**event))
+        after_commit(db, lambda: audit_events_total.inc(result="written"))
+
+    def _enqueue(self, event: dict, timeout: Optional[float]) -> bool:
+        """
+        Coloca o evento na fila, esperando até timeout com ela cheia
+
+        timeout=None não espera e deixa queue.Full subir (arecord tenta de
+        novo no threadpool). Depois de stop() o evento é descartado.
+        """
+        if not self._ensure_started():
+            audit_events_total.inc(result="dropped")
+            return False
+        if timeout is None:
+            self._queue.put_nowait(event)
+        else:
+            try:
+                self._queue.put(event, timeout=timeout)
+            except queue.Full:
+                audit_events_total.inc(result="dropped")
+                return False
+        audit_events_total.inc(result="enqueued")
+        return True
+
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    def _next_batch(self):
+        """Coleta até batch_size eventos, esperando no máximo flush_interval"""
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _flush(self, batch: List[dict]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(LogEvent).values(batch))
+            db.commit()
+            audit_events_total.inc(len(batch), result="written")
+        except Exception as e:
+            db.rollback()
+            audit_events_total.inc(len(batch), result="failed")
+            print(f"[audit] ERRO ao gravar {len(batch)} eventos de auditoria: {e}")
+        finally:
+            db.close()
+
+
+audit_log = AuditLogWriter(
+    max_queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+)
+
+Gauge("audit_queue_size", "Eventos de auditoria aguardando gravação", collect=lambda: [((), audit_log.queue_size())])
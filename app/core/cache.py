@@ -0,0 +1,209 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.models.user import UserRole
+
+
+class CacheBackend:
+    """Interface mínima de cache chave/valor com TTL (subconjunto da API do Redis)"""
+
+    # True quando get/set/delete fazem I/O de rede: os métodos async dos
+    # caches (aget/aset) chamam o backend no threadpool em vez do event loop
+    blocking = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Cache desligado: nunca guarda nada"""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """Cache LRU com TTL no processo (padrão). Limitado a max_entries chaves."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache em Redis (compartilhado entre réplicas).
+
+    Aceita qualquer cliente com get/setex/delete no estilo redis-py, então um
+    fake local pode substituir o Redis real em testes.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "pbc:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.setex(self.prefix + key, ttl, json.dumps(value))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+def build_cache_backend(backend: str) -> CacheBackend:
+    """Cria o backend de cache configurado (memory, redis ou off)"""
+    if backend == "off":
+        return NullCache()
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("USER_CACHE_BACKEND=redis requer o pacote 'redis' instalado") from e
+        return RedisCache(redis.Redis.from_url(settings.REDIS_URL))
+    return InMemoryCache(max_entries=settings.USER_CACHE_MAX_ENTRIES)
+
+
+async def _call_backend(backend: CacheBackend, fn, *args):
+    """Chama fn direto se o backend é local, ou no threadpool se faz I/O de rede"""
+    if backend.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+
+@dataclass
+class UserSnapshot:
+    """Dados do usuário autenticado necessários para autorização"""
+    id: int
+    name: str
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(id=user.id, name=user.name, role=user.role, is_active=user.is_active)
+
+
+class UserCache:
+    """
+    Cache de UserSnapshot por user_id usado por get_current_user.
+
+    As escritas em UserCRUD invalidam a entrada do usuário; o TTL limita o
+    tempo de uma entrada desatualizada em caso de corrida com a invalidação.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, user_id: int) -> Optional[UserSnapshot]:
+        data = self.backend.get(f"user:{user_id}")
+        if data is None:
+            return None
+        return UserSnapshot(
+            id=data["id"],
+            name=data["name"],
+            role=UserRole(data["role"]),
+            is_active=data["is_active"],
+        )
+
+    def set(self, snapshot: UserSnapshot) -> None:
+        data = asdict(snapshot)
+        data["role"] = snapshot.role.value
+        self.backend.set(f"user:{snapshot.id}", data, self.ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.delete(f"user:{user_id}")
+
+    async def aget(self, user_id: int) -> Optional[UserSnapshot]:
+        """Versão de get para código async (não bloqueia o event loop com Redis)"""
+        return await _call_backend(self.backend, self.get, user_id)
+
+    async def aset(self, snapshot: UserSnapshot) -> None:
+        await _call_backend(self.backend, self.set, snapshot)
+
+
+class StatsCache:
+    """
+    Cache do resumo do dashboard (/api/stats).
+
+    TTL curto; as escritas que mudam as contagens (mensagens, benefícios,
+    papel/status de usuários) invalidam o resumo na hora.
+    """
+    KEY = "stats:summary"
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self) -> Optional[dict]:
+        return self.backend.get(self.KEY)
+
+    def set(self, summary: dict) -> None:
+        self.backend.set(self.KEY, summary, self.ttl)
+
+    def invalidate(self) -> None:
+        self.backend.delete(self.KEY)
+
+    async def aget(self) -> Optional[dict]:
+        """Versão de get para código async (não bloqueia o event loop com Redis)"""
+        return await _call_backend(self.backend, self.get)
+
+    async def aset(self, summary: dict) -> None:
+        await _call_backend(self.backend, self.set, summary)
+
+
+user_cache = UserCache(
+    build_cache_backend(settings.USER_CACHE_BACKEND),
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+stats_cache = StatsCache(
+    build_cache_backend(settings.USER_CACHE_BACKEND),
+    ttl=settings.STATS_CACHE_TTL_SECONDS,
+)
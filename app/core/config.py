@@ -14,11 +14,71 @@ class Settings(BaseSettings):
             url = url.replace("postgresql://", "postgresql+psycopg2://", 1)
         return url
 
+    # Usa engine/sessão assíncronos (asyncpg) nas rotas em vez do psycopg2 síncrono
+    DB_ASYNC: bool = False
+
+    def get_async_database_url(self) -> str:
+        """Retorna DATABASE_URL no formato do driver assíncrono (postgresql+asyncpg)."""
+        url = self.get_database_url()
+        if url.startswith("postgresql+psycopg2://"):
+            url = url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+        elif url.startswith("sqlite://"):
+            url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return url
+
+    # Pool de conexões (por engine, por réplica). Ignorado para SQLite.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Gravação em lote dos logs de auditoria (app/core/audit.py)
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.05
+
+    # Readiness (/ready): intervalo mínimo entre SELECT 1 e saturação máxima do pool
+    READY_DB_CHECK_INTERVAL_SECONDS: float = 5.0
+    READY_MAX_POOL_SATURATION: float = 1.0
+
     SECRET_KEY: str = "seu-secret-key-super-secreto-aqui-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 horas
     # CORS: SEMPRE definir no .env (dev e produção). Nada fixo no código.
     CORS_ORIGINS: str = ""
+    # Cache do usuário autenticado (get_current_user): memory, redis ou off
+    USER_CACHE_BACKEND: str = "memory"
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # Hash de senha (bcrypt): custo e pool dedicado de threads
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+    # Importação em massa de usuários (POST /api/users/import)
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_HASH_WORKERS: int = 4
+    IMPORT_MAX_ERRORS: int = 1000
+    # Resumo do dashboard (/api/stats): TTL do cache, invalidado também pelas escritas
+    STATS_CACHE_TTL_SECONDS: int = 30
+    # Retenção de log_events (python -m app.core.log_retention): meses mantidos no
+    # banco, diretório dos arquivos .jsonl.gz e partições mensais criadas à frente;
+    # cada réplica confere as partições a cada LOG_PARTITION_CHECK_INTERVAL_SECONDS (0 desliga)
+    LOG_RETENTION_MONTHS: int = 12
+    LOG_ARCHIVE_DIR: str = "archive/log_events"
+    LOG_PARTITION_MONTHS_AHEAD: int = 2
+    LOG_PARTITION_CHECK_INTERVAL_SECONDS: float = 21600
+    # Notificações em tempo real (GET /api/events, SSE): pub/sub memory ou postgres
+    # (LISTEN/NOTIFY, entre réplicas), eventos pendentes por conexão e intervalo do ping
+    EVENTS_BACKEND: str = "memory"
+    EVENTS_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    # Perfil de SQL por requisição (desenvolvimento): header Server-Timing e log
+    # das consultas; a mesma consulta repetida tantas vezes é apontada como N+1
+    QUERY_PROFILER: bool = False
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 3
 
     @property
     def cors_origins_list(self) -> List[str]:
@@ -1,22 +1,206 @@
-from sqlalchemy import create_engine
+import time
+from typing import Callable, List, Union
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
 
+pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Tempo de espera por uma conexão do pool",
+    labelnames=("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de espera no checkout (pool_wait_seconds)"""
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start, engine=self.engine_label)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede o tempo de espera no checkout"""
+    engine_label = "async"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start, engine=self.engine_label)
+
+
+def _engine_options(url: str, poolclass) -> dict:
+    """Opções de pool/conexão conforme o driver (SQLite usa o pool padrão)"""
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"timeout": 10}
+    elif url.startswith("postgresql"):
+        options["connect_args"] = {"connect_timeout": 10}
+    return options
+
+
+# Engine síncrono: sempre existe (create_all, seed e modo DB_ASYNC=false)
 engine = create_engine(
     settings.get_database_url(),
-    connect_args={"connect_timeout": 10},
+    **_engine_options(settings.get_database_url(), TimedQueuePool),
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False, como no assíncrono: o objeto gravado continua
+# utilizável após o commit sem um SELECT de recarga (refresh)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+# Engine assíncrono (asyncpg): só com DB_ASYNC=true
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_url = settings.get_async_database_url()
+    async_engine = create_async_engine(async_url, **_engine_options(async_url, TimedAsyncQueuePool))
+    # expire_on_commit=False: atributos continuam acessíveis após commit sem
+    # novo SELECT implícito (lazy load não é permitido fora de run_sync)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
+# Tipo da sessão entregue por get_db (depende de DB_ASYNC)
+DBSession = Union[Session, AsyncSession]
 
-def get_db():
-    """Dependency para obter sessão do banco de dados"""
-    db = SessionLocal()
+
+def pool_status() -> dict:
+    """Estado atual dos pools de conexão (por engine)"""
+    pools = {"sync": engine.pool}
+    if async_engine is not None:
+        pools["async"] = async_engine.pool
+    status = {}
+    for label, pool in pools.items():
+        if not isinstance(pool, QueuePool):
+            continue
+        status[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        }
+    return status
+
+
+def _collect_pool(field: str):
+    def collect():
+        return [((label, ), stats[field]) for label, stats in pool_status().items()]
+    return collect
+
+
+Gauge("db_pool_size", "Tamanho configurado do pool", ("engine",), collect=_collect_pool("size"))
+Gauge("db_pool_checked_out", "Conexões em uso", ("engine",), collect=_collect_pool("checked_out"))
+Gauge("db_pool_checked_in", "Conexões ociosas no pool", ("engine",), collect=_collect_pool("checked_in"))
+Gauge("db_pool_overflow", "Conexões de overflow abertas", ("engine",), collect=_collect_pool("overflow"))
+
+
+_DEFER_AFTER_COMMIT = "defer_after_commit"
+_COMMITTED_CALLBACKS = "committed_callbacks"
+
+
+def after_commit(db: DBSession, callback: Callable[[], None]) -> None:
+    """
+    Agenda callback para logo após o commit da transação atual da sessão
+    (invalidação de cache, notificação SSE...). Descartado se houver rollback.
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+def _run_callbacks(callbacks: List[Callable[[], None]]) -> None:
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            # O commit já aconteceu; o efeito colateral não deve derrubar a requisição
+            print(f"[db] ERRO em callback pós-commit: {e}")
+
+
+# Na classe Session: vale também para a sync_session das AsyncSession
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    callbacks = session.info.pop("after_commit", [])
+    if session.info.get(_DEFER_AFTER_COMMIT):
+        # Commit de AsyncSession roda no event loop: os callbacks (Redis,
+        # pg_notify) ficam para get_db executar no threadpool
+        session.info.setdefault(_COMMITTED_CALLBACKS, []).extend(callbacks)
+        return
+    _run_callbacks(callbacks)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session, previous_transaction):
+    # Rollback de SAVEPOINT não desfaz a transação externa
+    if not previous_transaction.nested:
+        session.info.pop("after_commit", None)
+
+
+def _finish_session(db: Session, commit: bool) -> None:
     try:
-        yield db
+        if commit:
+            db.commit()
+        else:
+            db.rollback()
     finally:
         db.close()
 
+
+async def get_db():
+    """
+    Dependency para obter sessão do banco de dados (unit of work)
+
+    Com DB_ASYNC=true entrega uma AsyncSession; senão, uma Session síncrona.
+    As rotas usam os CRUDs assíncronos (async_*_crud), que aceitam as duas.
+
+    A requisição inteira é uma transação: os CRUDs só fazem flush e o commit
+    acontece uma vez, aqui, quando a rota termina; se ela levantar exceção
+    (inclusive HTTPException), tudo é desfeito com rollback.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            db.sync_session.info[_DEFER_AFTER_COMMIT] = True
+            try:
+                try:
+                    yield db
+                except Exception:
+                    await db.rollback()
+                    raise
+                await db.commit()
+            finally:
+                # Callbacks pós-commit (inclusive de commits no meio da rota)
+                # rodam fora do event loop
+                callbacks = db.sync_session.info.pop(_COMMITTED_CALLBACKS, [])
+                if callbacks:
+                    await run_in_threadpool(_run_callbacks, callbacks)
+        return
+    
+    db = SessionLocal()
+    commit = False
+    try:
+        yield db
+        commit = True
+    finally:
+        # Commit (ou rollback) e close numa única ida ao threadpool
+        await run_in_threadpool(_finish_session, db, commit)
@@ -0,0 +1,45 @@
+import hashlib
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+
+# O navegador guarda a resposta, mas sempre revalida com If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    ETag fraco a partir das colunas que mudam quando a resposta muda
+    (ex.: [(id, updated_at), ...] das linhas da página)
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match contém a ETag (comparação fraca, como manda a RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Response]:
+    """
+    Retorna 304 se o cliente já tem esta versão; senão coloca ETag (e headers)
+    na resposta da rota e retorna None para ela seguir com a serialização
+    """
+    all_headers = {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL, **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=all_headers)
+    response.headers.update(all_headers)
+    return None
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import Gauge
+
+Subscriber = Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[dict]"]
+
+
+class InProcessBroker:
+    """
+    Pub/sub de eventos por usuário dentro do processo (padrão).
+
+    Cada conexão SSE é só uma asyncio.Queue limitada registrada para o
+    user_id; publish() pode ser chamado de qualquer thread (os CRUDs rodam
+    no threadpool) e entrega via call_soon_threadsafe. Com a fila cheia, o
+    evento mais antigo é descartado. Só alcança conexões desta réplica.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def publish(self, user_id: int, event: dict) -> None:
+        self._dispatch(user_id, event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator["asyncio.Queue[dict]"]:
+        queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(entry)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                entries = self._subscribers.get(user_id)
+                if entries is not None:
+                    entries.discard(entry)
+                    if not entries:
+                        del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._subscribers.values())
+
+    def _dispatch(self, user_id: int, event: dict) -> None:
+        with self._lock:
+            entries = list(self._subscribers.get(user_id, ()))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Event loop já encerrado (shutdown)
+                pass
+
+    @staticmethod
+    def _offer(queue: "asyncio.Queue[dict]", event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Pub/sub entre réplicas via PostgreSQL LISTEN/NOTIFY.
+
+    publish() faz pg_notify no canal; uma thread por réplica mantém uma
+    conexão dedicada em LISTEN e repassa cada notificação às conexões SSE
+    locais. O payload do NOTIFY é limitado (8000 bytes), então os eventos
+    devem ser pequenos.
+    """
+
+    CHANNEL = "pbc_events"
+
+    def __init__(self, engine: Engine, queue_size: int = 100, reconnect_delay: float = 2.0):
+        super().__init__(queue_size)
+        self.engine = engine
+        self.reconnect_delay = reconnect_delay
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="events-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def publish(self, user_id: int, event: dict) -> None:
+        payload = json.dumps({"user_id": user_id, "event": event}, default=str)
+        with self.engine.begin() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.CHANNEL, "payload": payload})
+
+    def _listen(self) -> None:
+        import select
+        import psycopg2
+
+        connect_args = self.engine.url.translate_connect_args(username="user", database="dbname")
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**connect_args)
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {self.CHANNEL}")
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        data = json.loads(notify.payload)
+                        self._dispatch(data["user_id"], data["event"])
+            except Exception as e:
+                print(f"[events] Conexão LISTEN perdida, reconectando: {e}")
+                time.sleep(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+def build_event_broker(backend: str) -> InProcessBroker:
+    """Cria o pub/sub configurado (memory ou postgres)"""
+    if backend == "postgres":
+        if engine.dialect.name == "postgresql":
+            return PostgresBroker(engine, queue_size=settings.EVENTS_QUEUE_SIZE)
+        print("[events] EVENTS_BACKEND=postgres requer PostgreSQL; usando pub/sub em memória")
+    return InProcessBroker(queue_size=settings.EVENTS_QUEUE_SIZE)
+
+
+event_broker = build_event_broker(settings.EVENTS_BACKEND)
+
+Gauge(
+    "sse_subscribers",
+    "Conexões SSE abertas nesta réplica",
+    collect=lambda: [((), event_broker.subscriber_count())],
+)
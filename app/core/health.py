@@ -0,0 +1,105 @@
+import time
+from typing import Optional
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core import database
+
+
+class DBInitState:
+    """Estado do init do banco (create_all + seed) que roda em background no startup"""
+
+    def __init__(self):
+        self.status = "pending"  # pending, running, done, failed
+        self.detail: Optional[str] = None
+
+    def set(self, status: str, detail: Optional[str] = None) -> None:
+        self.status = status
+        self.detail = detail
+
+
+db_init_state = DBInitState()
+
+
+def routes_pool() -> str:
+    """Pool usado pelas rotas: o do engine assíncrono com DB_ASYNC=true"""
+    return "async" if database.async_engine is not None else "sync"
+
+
+class DBConnectivityCheck:
+    """
+    SELECT 1 com resultado em cache: no máximo uma consulta a cada
+    interval segundos, não importa quantas vezes o probe seja chamado
+
+    A consulta usa o engine das rotas (async_engine com DB_ASYNC=true).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._checked_at = 0.0
+        self._ok = False
+        self._detail: Optional[str] = None
+
+    async def check(self):
+        if time.monotonic() - self._checked_at >= self.interval:
+            # Marcado antes da consulta: probes simultâneos usam o último resultado
+            self._checked_at = time.monotonic()
+            try:
+                await self._select_one()
+                self._ok, self._detail = True, None
+            except Exception as e:
+                self._ok, self._detail = False, str(getattr(e, "orig", e))
+        return self._ok, self._detail
+
+    @staticmethod
+    async def _select_one() -> None:
+        if database.async_engine is not None:
+            async with database.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return
+
+        def select_one():
+            with database.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        await run_in_threadpool(select_one)
+
+    def last_result(self):
+        """Último resultado, sem consultar o banco"""
+        return self._ok, self._detail
+
+
+db_check = DBConnectivityCheck(interval=settings.READY_DB_CHECK_INTERVAL_SECONDS)
+
+
+def pool_saturation() -> float:
+    """Fração das conexões possíveis (pool + overflow) em uso no pool das rotas"""
+    stats = database.pool_status().get(routes_pool())
+    if not stats:
+        return 0.0
+    capacity = stats["size"] + stats["max_overflow"]
+    return stats["checked_out"] / capacity if capacity else 0.0
+
+
+async def readiness() -> dict:
+    """Avalia se a réplica pode receber tráfego"""
+    saturation = pool_saturation()
+    checks = {
+        "db_init": {"ok": db_init_state.status == "done", "status": db_init_state.status},
+        "pool": {
+            "ok": saturation < settings.READY_MAX_POOL_SATURATION,
+            "engine": routes_pool(),
+            "saturation": round(saturation, 3),
+        },
+    }
+    if db_init_state.detail:
+        checks["db_init"]["detail"] = db_init_state.detail
+    # Com o pool esgotado o SELECT 1 ficaria esperando conexão: reutiliza o último resultado
+    db_ok, db_detail = await db_check.check() if checks["pool"]["ok"] else db_check.last_result()
+    checks["database"] = {"ok": db_ok}
+    if db_detail:
+        checks["database"]["detail"] = db_detail
+    return {
+        "status": "ready" if all(c["ok"] for c in checks.values()) else "not_ready",
+        "checks": checks,
+    }
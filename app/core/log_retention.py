@@ -0,0 +1,306 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from app.core.config import settings
+from app.core.database import engine as default_engine
+
+# Partições mensais criadas pela migração 0003: log_events_pAAAAMM
+PARTITION_NAME = re.compile(r"^log_events_p(\d{4})(\d{2})$")
+# Partição DEFAULT: recebe linhas de meses ainda sem partição
+DEFAULT_PARTITION = "log_events_default"
+
+EXPORT_COLUMNS = "id, user_id, event_type, description, created_at"
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"log_events_p{month:%Y%m}"
+
+
+class LogRetention:
+    """
+    Particionamento mensal e retenção de log_events.
+
+    No PostgreSQL com log_events particionada (migração 0003):
+    - ensure_partitions() cria as partições do mês atual e dos próximos
+      months_ahead meses (no startup e periodicamente, por
+      start_partition_maintenance), para que nada caia na
+      partição DEFAULT; se a DEFAULT já tem linhas do mês (startup parado,
+      datas retroativas), elas são movidas para a nova partição
+    - run() grava cada partição mais antiga que retention_months em
+      archive_dir/log_events_AAAA_MM.jsonl.gz e então faz DETACH + DROP;
+      linhas expiradas que estão na DEFAULT são arquivadas por mês e
+      removidas com DELETE
+
+    Sem particionamento (SQLite ou antes da migração) run() faz o mesmo por
+    mês com SELECT + DELETE por intervalo de created_at.
+    """
+
+    def __init__(
+        self,
+        engine: Engine = default_engine,
+        archive_dir: str = "archive/log_events",
+        retention_months: int = 12,
+        months_ahead: int = 2,
+        batch_size: int = 5000,
+    ):
+        self.engine = engine
+        self.archive_dir = archive_dir
+        self.retention_months = retention_months
+        self.months_ahead = months_ahead
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_partition_maintenance(self, interval: float) -> None:
+        """
+        Thread que repete ensure_partitions a cada interval segundos
+
+        Uma réplica que fica no ar mais que months_ahead meses continua
+        criando as partições à frente. interval <= 0 desliga.
+        """
+        if interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._maintain_partitions, args=(interval,), name="log-partitions", daemon=True
+        )
+        self._thread.start()
+
+    def stop_partition_maintenance(self) -> None:
+        self._stop.set()
+
+    def _maintain_partitions(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                created = self.ensure_partitions()
+                if created:
+                    print(f"[retention] Partições de log_events criadas: {', '.join(created)}")
+            except Exception as e:
+                # Outra réplica pode ter criado a mesma partição; tenta de novo no próximo ciclo
+                print(f"[retention] ERRO ao criar partições de log_events: {e}")
+
+    def is_partitioned(self, conn: Connection) -> bool:
+        if conn.dialect.name != "postgresql":
+            return False
+        return conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('log_events'))"
+        )).scalar()
+
+    def ensure_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """Cria as partições que faltam do mês atual até months_ahead à frente"""
+        first = month_start(now or datetime.utcnow())
+        created = []
+        with self.engine.begin() as conn:
+            if not self.is_partitioned(conn):
+                return created
+            existing = set(self._partitions(conn))
+            for offset in range(self.months_ahead + 1):
+                month = add_months(first, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                if DEFAULT_PARTITION in existing and self._default_has_rows(conn, month):
+                    self._create_from_default(conn, month)
+                else:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF log_events"
+                        f" FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                    ))
+                created.append(name)
+        return created
+
+    def _default_has_rows(self, conn: Connection, month: datetime) -> bool:
+        return conn.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)"),
+            {"start": month, "end": add_months(month, 1)},
+        ).scalar()
+
+    def _create_from_default(self, conn: Connection, month: datetime) -> None:
+        """
+        Cria a partição do mês levando junto as linhas do mês que estão na DEFAULT
+
+        O PostgreSQL recusa criar uma partição cujo intervalo já tem linhas na
+        DEFAULT. A partição nasce como tabela comum, recebe as linhas (DELETE
+        ... RETURNING da DEFAULT) e só então é anexada; tudo na transação do
+        chamador, então ninguém vê o mês pela metade.
+        """
+        name = partition_name(month)
+        bounds = f"FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        conn.execute(text(f"CREATE TABLE {name} (LIKE log_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        moved = conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION}"
+                f" WHERE created_at >= :start AND created_at < :end RETURNING {EXPORT_COLUMNS})"
+                f" INSERT INTO {name} ({EXPORT_COLUMNS}) SELECT {EXPORT_COLUMNS} FROM moved"
+            ),
+            {"start": month, "end": add_months(month, 1)},
+        ).rowcount
+        # ATTACH cria na partição os índices (e a chave primária) da tabela pai
+        conn.execute(text(f"ALTER TABLE log_events ATTACH PARTITION {name} FOR VALUES {bounds}"))
+        print(f"[retention] {moved} logs movidos de {DEFAULT_PARTITION} para {name}")
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Logs antes desta data (início de mês) são arquivados"""
+        return add_months(month_start(now or datetime.utcnow()), -self.retention_months)
+
+    def run(self, dry_run: bool = False, now: Optional[datetime] = None) -> List[dict]:
+        """Arquiva e remove os meses fora da retenção; retorna o que foi (ou seria) feito"""
+        cutoff = self.cutoff(now)
+        # (mês, tabela de origem, remove a partição inteira)
+        jobs = []
+        with self.engine.connect() as conn:
+            if self.is_partitioned(conn):
+                jobs += [(month, partition_name(month), True) for month in self._expired_partitions(conn, cutoff)]
+                partitions = set(self._partitions(conn))
+                if DEFAULT_PARTITION in partitions:
+                    # Meses com partição própria não têm linhas na DEFAULT
+                    jobs += [
+                        (month, DEFAULT_PARTITION, False)
+                        for month in self._expired_months(conn, cutoff, DEFAULT_PARTITION)
+                        if partition_name(month) not in partitions
+                    ]
+            else:
+                jobs += [(month, "log_events", False) for month in self._expired_months(conn, cutoff)]
+
+        results = []
+        for month, table, drop in sorted(jobs, key=lambda job: job[0]):
+            path = self._archive_path(month)
+            if dry_run:
+                results.append({"mes": f"{month:%Y-%m}", "linhas": None, "arquivo": path})
+                continue
+            if drop:
+                rows = self._archive_partition(month, path)
+            else:
+                rows = self._archive_range(month, path, table)
+            if rows == 0:
+                path = None
+            print(f"[retention] {month:%Y-%m}: {rows} logs arquivados" + (f" em {path}" if path else ""))
+            results.append({"mes": f"{month:%Y-%m}", "linhas": rows, "arquivo": path})
+        return results
+
+    def _archive_path(self, month: datetime) -> str:
+        """Arquivo do mês; nunca sobrescreve um arquivo de execução anterior"""
+        base = os.path.join(self.archive_dir, f"log_events_{month:%Y_%m}")
+        path = f"{base}.jsonl.gz"
+        suffix = 1
+        while os.path.exists(path):
+            path = f"{base}.{suffix}.jsonl.gz"
+            suffix += 1
+        return path
+
+    def _partitions(self, conn: Connection) -> List[str]:
+        return list(conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass('log_events')"
+        )).scalars())
+
+    def _expired_partitions(self, conn: Connection, cutoff: datetime) -> List[datetime]:
+        months = []
+        for name in self._partitions(conn):
+            match = PARTITION_NAME.match(name)
+            if match:
+                month = datetime(int(match.group(1)), int(match.group(2)), 1)
+                if add_months(month, 1) <= cutoff:
+                    months.append(month)
+        return sorted(months)
+
+    def _expired_months(self, conn: Connection, cutoff: datetime, table: str = "log_events") -> List[datetime]:
+        oldest = conn.execute(
+            text(f"SELECT MIN(created_at) FROM {table} WHERE created_at < :cutoff"),
+            {"cutoff": cutoff},
+        ).scalar()
+        if oldest is None:
+            return []
+        if isinstance(oldest, str):  # SQLite devolve texto em agregações
+            oldest = datetime.fromisoformat(oldest)
+        months = []
+        month = month_start(oldest)
+        while month < cutoff:
+            months.append(month)
+            month = add_months(month, 1)
+        return months
+
+    def _archive_partition(self, month: datetime, path: str) -> int:
+        name = partition_name(month)
+        with self.engine.connect() as conn:
+            rows = self._write_archive(
+                conn, f"SELECT {EXPORT_COLUMNS} FROM {name} ORDER BY created_at, id", {}, path
+            )
+        # Só remove depois que o arquivo foi gravado por completo
+        with self.engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE log_events DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+        return rows
+
+    def _archive_range(self, month: datetime, path: str, table: str = "log_events") -> int:
+        params = {"start": month, "end": add_months(month, 1)}
+        where = "created_at >= :start AND created_at < :end"
+        with self.engine.connect() as conn:
+            rows = self._write_archive(
+                conn, f"SELECT {EXPORT_COLUMNS} FROM {table} WHERE {where} ORDER BY created_at, id", params, path
+            )
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {table} WHERE {where}"), params)
+        return rows
+
+    def _write_archive(self, conn: Connection, query: str, params: dict, path: str) -> int:
+        """Grava o resultado em JSONL gzip (arquivo temporário + rename)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        rows = 0
+        result = conn.execution_options(yield_per=self.batch_size).execute(text(query), params)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for row in result:
+                data = dict(row._mapping)
+                created_at = data["created_at"]
+                data["created_at"] = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+                f.write(json.dumps(data, ensure_ascii=False) + "\n")
+                rows += 1
+        if rows == 0:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return rows
+
+
+log_retention = LogRetention(
+    archive_dir=settings.LOG_ARCHIVE_DIR,
+    retention_months=settings.LOG_RETENTION_MONTHS,
+    months_ahead=settings.LOG_PARTITION_MONTHS_AHEAD,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquiva e remove logs de auditoria fora da retenção")
+    parser.add_argument("--dry-run", action="store_true", help="apenas lista os meses que seriam arquivados")
+    args = parser.parse_args()
+
+    created = log_retention.ensure_partitions()
+    if created:
+        print(f"[retention] Partições criadas: {', '.join(created)}")
+    results = log_retention.run(dry_run=args.dry_run)
+    if not results:
+        print(f"[retention] Nada a arquivar (retenção: {log_retention.retention_months} meses)")
+    elif args.dry_run:
+        for item in results:
+            print(f"[retention] {item['mes']} seria arquivado em {item['arquivo']}")
+
+
+if __name__ == "__main__":
+    main()
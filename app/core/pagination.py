@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int, created_at: Optional[datetime] = None) -> str:
+    """Gera cursor opaco (base64) a partir da chave da última linha da página"""
+    payload = {"id": last_id}
+    if created_at is not None:
+        payload["ts"] = created_at.isoformat()
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, with_timestamp: bool = False) -> Tuple[int, Optional[datetime]]:
+    """Decodifica cursor em (id, created_at). Levanta ValueError se inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        last_id = int(payload["id"])
+        created_at = datetime.fromisoformat(payload["ts"]) if with_timestamp else None
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError) as e:
+        raise ValueError("Cursor inválido") from e
+    return last_id, created_at
+
+
+def next_cursor(items: Sequence[Any], limit: int, with_timestamp: bool = False) -> Optional[str]:
+    """Retorna cursor da próxima página, ou None se esta página for a última"""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.id, last.created_at if with_timestamp else None)
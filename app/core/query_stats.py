@@ -0,0 +1,134 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Listas de IN expandidas (?, ?, ?) viram uma só forma, independente do tamanho
+_IN_LIST = re.compile(r"\bIN \((?:\?|%\(\w+\)s|\$\d+|:\w+)(?:, (?:\?|%\(\w+\)s|\$\d+|:\w+))*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Forma da consulta: o SQL parametrizado sem quebras de linha e com IN (...) colapsado"""
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """
+    Consultas SQL executadas durante uma requisição.
+
+    Com profile=True guarda também quantidade e tempo por forma de consulta
+    (statement_shape), para achar a mesma consulta repetida (N+1).
+    """
+
+    def __init__(self, profile: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.profile = profile
+        self.shapes: Dict[str, List] = {}
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        if self.profile:
+            entry = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int, float]]:
+        """Formas executadas threshold vezes ou mais: (sql, vezes, segundos), mais repetidas primeiro"""
+        return sorted(
+            ((shape, count, duration) for shape, (count, duration) in self.shapes.items() if count >= threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Uma requisição passou do número de consultas permitido (query_budget)"""
+
+
+class QueryBudget:
+    def __init__(self, max_queries: int, max_repeats: Optional[int] = None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.requests: List[Tuple[str, QueryStats]] = []
+
+    def violations(self) -> List[str]:
+        problems = []
+        for label, stats in self.requests:
+            if stats.count > self.max_queries:
+                problems.append(f"{label}: {stats.count} consultas (limite {self.max_queries})")
+            if self.max_repeats is not None:
+                for shape, count, _ in stats.repeated(self.max_repeats + 1):
+                    problems.append(f"{label}: {count}x a mesma consulta (limite {self.max_repeats}): {shape[:200]}")
+        return problems
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_active_budgets: List[QueryBudget] = []
+
+
+def start_request_stats(profile: bool = False):
+    """Começa a contar consultas no contexto atual; retorna (stats, token)"""
+    stats = QueryStats(profile=profile or bool(_active_budgets))
+    return stats, _current_stats.set(stats)
+
+
+def end_request_stats(token, label: str = "") -> None:
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+    for budget in list(_active_budgets):
+        budget.requests.append((label, stats))
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[QueryBudget]:
+    """
+    Para testes: falha (QueryBudgetExceeded) se alguma requisição feita dentro
+    do bloco executou mais de max_queries consultas ou repetiu a mesma forma
+    de consulta mais de max_repeats vezes.
+
+        with query_budget(3, max_repeats=1):
+            client.get("/api/logs", headers=headers)
+
+    Conta só as consultas das requisições (via MetricsMiddleware), não as de
+    threads de fundo como a gravação da auditoria.
+    """
+    budget = QueryBudget(max_queries, max_repeats)
+    _active_budgets.append(budget)
+    try:
+        yield budget
+    finally:
+        _active_budgets.remove(budget)
+    problems = budget.violations()
+    if problems:
+        raise QueryBudgetExceeded("Orçamento de consultas excedido:\n" + "\n".join(problems))
+
+
+# Registrado na classe Engine: vale para o engine síncrono e para o
+# sync_engine do engine assíncrono. O contexto é propagado para o threadpool
+# e para o run_sync, então as consultas caem na requisição certa; fora de
+# uma requisição (seed, gravação de auditoria) nada é contado.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    stats.add(statement, time.perf_counter() - starts.pop())
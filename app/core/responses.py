@@ -0,0 +1,19 @@
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> ORJSONResponse:
+    """
+    Resposta serializada direto com orjson, sem a segunda validação contra o
+    response_model (que continua valendo para a documentação OpenAPI).
+
+    Use só com dados montados pelos mappers (*_to_response), que já têm o
+    formato do schema. Headers definidos no Response injetado na rota
+    (X-Next-Cursor, ETag...) são copiados, pois o FastAPI os ignora quando a
+    rota retorna uma Response.
+    """
+    result = ORJSONResponse(content, status_code=status_code)
+    if response is not None:
+        result.raw_headers.extend(response.raw_headers)
+    return result
@@ -1,5 +1,8 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -7,22 +10,98 @@ from app.core.config import settings
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
     bcrypt__ident="2b"
 )
 
+# bcrypt libera o GIL, então um pool de threads dedicado basta: limita quantos
+# hashes rodam ao mesmo tempo sem ocupar todo o threadpool do servidor.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+# Pool separado para a importação em massa, para não disputar com o login
+_import_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.IMPORT_HASH_WORKERS,
+    thread_name_prefix="bcrypt-import",
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Fila do pool de hash de senha cheia (pico de logins)"""
+
+
+def _run_in_hash_pool(fn, *args):
+    """Executa fn no pool de bcrypt, recusando quando a fila está cheia"""
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return _hash_executor.submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+
+async def _run_in_hash_pool_async(fn, *args):
+    """Como _run_in_hash_pool, mas aguarda o resultado sem bloquear o event loop"""
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return await asyncio.wrap_future(_hash_executor.submit(fn, *args))
+    finally:
+        _hash_slots.release()
+
+
+def _truncate_password(password: str) -> str:
+    # Bcrypt tem limite de 72 bytes, truncar se necessário
+    if isinstance(password, str) and len(password.encode('utf-8')) > 72:
+        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+    return password
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto plano corresponde ao hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash usa parâmetros antigos (ex.: BCRYPT_ROUNDS
+    mudou), retorna também o novo hash para ser salvo. Senão, novo hash é None.
+    """
+    return _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def averify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Versão assíncrona de verify_and_update_password (para rotas async)"""
+    return await _run_in_hash_pool_async(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Gera hash da senha"""
-    # Bcrypt tem limite de 72 bytes, truncar se necessário
-    if isinstance(password, str) and len(password.encode('utf-8')) > 72:
-        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return _run_in_hash_pool(pwd_context.hash, _truncate_password(password))
+
+
+async def aget_password_hash(password: str) -> str:
+    """Versão assíncrona de get_password_hash (para rotas async)"""
+    return await _run_in_hash_pool_async(pwd_context.hash, _truncate_password(password))
+
+
+def hash_passwords_bulk(passwords: List[str]) -> List[str]:
+    """Gera os hashes de um lote de senhas em paralelo (importação em massa)"""
+    return list(_import_hash_executor.map(pwd_context.hash, [_truncate_password(p) for p in passwords]))
+
+
+async def ahash_passwords_bulk(passwords: List[str]) -> List[str]:
+    """Versão assíncrona de hash_passwords_bulk: aguarda o lote sem bloquear o event loop"""
+    futures = [
+        asyncio.wrap_future(_import_hash_executor.submit(pwd_context.hash, _truncate_password(p)))
+        for p in passwords
+    ]
+    return list(await asyncio.gather(*futures))
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -1,7 +1,9 @@
-from app.crud.user import user_crud
-from app.crud.benefit import benefit_crud
-from app.crud.message import message_crud
-from app.crud.log_event import log_event_crud
-
-__all__ = ["user_crud", "benefit_crud", "message_crud", "log_event_crud"]
+from app.crud.user import user_crud, async_user_crud
+from app.crud.benefit import benefit_crud, async_benefit_crud
+from app.crud.message import message_crud, async_message_crud
+from app.crud.log_event import log_event_crud, async_log_event_crud
 
+__all__ = [
+    "user_crud", "benefit_crud", "message_crud", "log_event_crud",
+    "async_user_crud", "async_benefit_crud", "async_message_crud", "async_log_event_crud"
+]
@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+
+class AsyncCRUD:
+    """
+    Versão assíncrona de um CRUD (UserCRUD, BenefitCRUD, ...): cada método vira
+    uma corrotina com a mesma assinatura, recebendo a sessão de get_db.
+
+    - AsyncSession (DB_ASYNC=true): o método roda via AsyncSession.run_sync,
+      com o I/O no asyncpg sem bloquear o event loop
+    - Session síncrona: o método roda no threadpool
+
+    Assim a lógica de consulta continua num único lugar (os CRUDs síncronos,
+    também usados pelo seed).
+    """
+
+    def __init__(self, crud):
+        self._crud = crud
+
+    def __getattr__(self, name):
+        method = getattr(self._crud, name)
+        if not callable(method):
+            return method
+
+        async def call(db, *args, **kwargs):
+            if isinstance(db, AsyncSession):
+                return await db.run_sync(method, *args, **kwargs)
+            return await run_in_threadpool(method, db, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        # Guarda o wrapper para não recriá-lo a cada chamada
+        setattr(self, name, call)
+        return call
@@ -1,6 +1,14 @@
+from sqlalchemy import String, and_, exists, insert, literal, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.models.benefit import Benefit
+from app.models.user import User, UserRole
+from app.core.pagination import decode_cursor
+from app.schemas.serializers import BENEFIT_RESPONSE_COLUMNS
+from app.crud.async_crud import AsyncCRUD
+from app.core.cache import stats_cache
+from app.core.database import after_commit
 
 
 class BenefitCRUD:
@@ -8,9 +16,9 @@ class BenefitCRUD:
         """Busca benefício por ID"""
         return db.query(Benefit).filter(Benefit.id == benefit_id).first()
     
-    def get_by_user_id(self, db: Session, user_id: int) -> List[Benefit]:
-        """Lista benefícios de um usuário específico"""
-        return db.query(Benefit).filter(Benefit.user_id == user_id).all()
+    def get_by_user_id(self, db: Session, user_id: int) -> List[Row]:
+        """Lista benefícios de um usuário específico (Row com as colunas da resposta)"""
+        return db.query(*BENEFIT_RESPONSE_COLUMNS).filter(Benefit.user_id == user_id).all()
     
     def get_multi(
         self, 
@@ -19,10 +27,11 @@ class BenefitCRUD:
         limit: int = 100,
         user_id: Optional[int] = None,
         category: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> List[Benefit]:
-        """Lista benefícios com filtros opcionais"""
-        query = db.query(Benefit)
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Row]:
+        """Lista benefícios com filtros opcionais (cursor: keyset em id; Row com as colunas da resposta)"""
+        query = db.query(*BENEFIT_RESPONSE_COLUMNS)
         
         if user_id:
             query = query.filter(Benefit.user_id == user_id)
@@ -33,7 +42,11 @@ class BenefitCRUD:
         if status:
             query = query.filter(Benefit.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        if cursor:
+            last_id, _ = decode_cursor(cursor)
+            query = query.filter(Benefit.id > last_id)
+        
+        return query.order_by(Benefit.id).offset(skip).limit(limit).all()
     
     def create(self, db: Session, benefit_data: dict) -> Benefit:
         """Cria novo benefício"""
@@ -47,10 +60,84 @@ class BenefitCRUD:
         )
         
         db.add(benefit)
-        db.commit()
-        db.refresh(benefit)
+        db.flush()
+        after_commit(db, stats_cache.invalidate)
         return benefit
+    
+    def bulk_assign(
+        self,
+        db: Session,
+        benefit_data: dict,
+        role: Optional[str] = None,
+        user_ids: Optional[List[int]] = None,
+        only_active: bool = True,
+        skip_existing: bool = True
+    ) -> int:
+        """
+        Concede o benefício a todos os usuários filtrados com um único
+        INSERT ... SELECT. Retorna a quantidade de benefícios criados.
+        """
+        name = benefit_data.get("nome") or benefit_data.get("name")
+        users = select(
+            User.id,
+            literal(name, String),
+            literal(benefit_data.get("categoria") or benefit_data.get("category"), String),
+            literal(benefit_data.get("status"), String),
+            literal(benefit_data.get("valor") or benefit_data.get("value"), String),
+            literal(benefit_data.get("descricao") or benefit_data.get("description"), String),
+        )
+        
+        if role:
+            users = users.where(User.role == UserRole(role))
+        
+        if user_ids is not None:
+            users = users.where(User.id.in_(user_ids))
+        
+        if only_active:
+            users = users.where(User.is_active.is_(True))
+        
+        if skip_existing:
+            users = users.where(~exists().where(and_(Benefit.user_id == User.id, Benefit.name == name)))
+        
+        result = db.execute(
+            insert(Benefit).from_select(
+                ["user_id", "name", "category", "status", "value", "description"],
+                users
+            )
+        )
+        after_commit(db, stats_cache.invalidate)
+        return result.rowcount
+    
+    def bulk_update_status(
+        self,
+        db: Session,
+        new_status: str,
+        category: Optional[str] = None,
+        name: Optional[str] = None,
+        user_ids: Optional[List[int]] = None
+    ) -> int:
+        """
+        Altera o status dos benefícios filtrados com um único UPDATE ... WHERE.
+        Linhas que já estão no status pedido não são reescritas.
+        Retorna a quantidade de benefícios alterados.
+        """
+        stmt = update(Benefit).where(Benefit.status != new_status)
+        
+        if category:
+            stmt = stmt.where(Benefit.category == category)
+        
+        if name:
+            stmt = stmt.where(Benefit.name == name)
+        
+        if user_ids is not None:
+            stmt = stmt.where(Benefit.user_id.in_(user_ids))
+        
+        result = db.execute(
+            stmt.values(status=new_status).execution_options(synchronize_session=False)
+        )
+        after_commit(db, stats_cache.invalidate)
+        return result.rowcount
 
 
 benefit_crud = BenefitCRUD()
-
+async_benefit_crud = AsyncCRUD(benefit_crud)
@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload
+from typing import Iterator, Optional, List
 from datetime import datetime
 from app.models.log_event import LogEvent
+from app.models.user import User
+from app.core.pagination import decode_cursor
+from app.crud.async_crud import AsyncCRUD
 
 
 class LogEventCRUD:
@@ -17,11 +22,67 @@ class LogEventCRUD:
         user_id: Optional[int] = None,
         event_type: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        with_user: bool = False,
+        cursor: Optional[str] = None
     ) -> List[LogEvent]:
-        """Lista logs com filtros opcionais"""
+        """
+        Lista logs com filtros opcionais
+
+        Com with_user=True o nome do usuário vem no mesmo SELECT (LEFT JOIN),
+        evitando uma consulta extra por linha ao acessar log.user.
+        Com cursor, a página começa logo após (created_at, id) do cursor
+        (keyset), sem o custo crescente do OFFSET em páginas profundas.
+        """
         query = db.query(LogEvent)
         
+        if with_user:
+            query = query.options(joinedload(LogEvent.user).load_only(User.name))
+        
+        query = self._apply_filters(query, user_id, event_type, start_date, end_date)
+        
+        if cursor:
+            last_id, last_created_at = decode_cursor(cursor, with_timestamp=True)
+            query = query.filter(tuple_(LogEvent.created_at, LogEvent.id) < (last_created_at, last_id))
+        
+        query = query.order_by(LogEvent.created_at.desc(), LogEvent.id.desc())
+        return query.offset(skip).limit(limit).all()
+    
+    def iter_export(
+        self,
+        db: Session,
+        user_id: Optional[int] = None,
+        event_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """
+        Percorre todos os logs filtrados (com o nome do usuário) em ordem
+        cronológica para exportação.
+
+        As linhas são lidas em lotes de batch_size por um cursor no servidor
+        (yield_per), então a memória não cresce com o tamanho do resultado.
+        """
+        stmt = select(
+            LogEvent.id,
+            LogEvent.created_at,
+            LogEvent.user_id,
+            User.name.label("user_name"),
+            LogEvent.event_type,
+            LogEvent.description,
+        ).outerjoin(User, LogEvent.user_id == User.id)
+        stmt = self._apply_filters(stmt, user_id, event_type, start_date, end_date)
+        stmt = stmt.order_by(LogEvent.created_at, LogEvent.id)
+        
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        try:
+            yield from result
+        finally:
+            result.close()
+    
+    def _apply_filters(self, query, user_id, event_type, start_date, end_date):
+        """Filtros comuns da listagem e da exportação (Query ou Select)"""
         if user_id:
             query = query.filter(LogEvent.user_id == user_id)
         
@@ -34,7 +95,7 @@ class LogEventCRUD:
         if end_date:
             query = query.filter(LogEvent.created_at <= end_date)
         
-        return query.order_by(LogEvent.created_at.desc()).offset(skip).limit(limit).all()
+        return query
     
     def create(self, db: Session, log_data: dict) -> LogEvent:
         """Cria novo log"""
@@ -45,10 +106,9 @@ class LogEventCRUD:
         )
         
         db.add(log)
-        db.commit()
-        db.refresh(log)
+        db.flush()
         return log
 
 
 log_event_crud = LogEventCRUD()
-
+async_log_event_crud = AsyncCRUD(log_event_crud)
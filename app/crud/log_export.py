@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from typing import Iterator
+from app.core.database import SessionLocal
+from app.crud.log_event import log_event_crud
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+CSV_HEADER = ("id", "dataHora", "userId", "usuario", "tipoEvento", "descricao")
+
+
+def _row_values(row) -> tuple:
+    return (
+        row.id,
+        row.created_at.isoformat(),
+        row.user_id,
+        row.user_name or "",
+        row.event_type,
+        row.description,
+    )
+
+
+class LogExporter:
+    """
+    Exportação completa dos logs de auditoria em CSV ou NDJSON.
+
+    stream() é um gerador síncrono para StreamingResponse (que o consome em
+    threadpool): abre a própria sessão, pois a resposta continua sendo
+    enviada depois que a rota retorna, e lê as linhas em lotes de batch_size
+    (LogEventCRUD.iter_export). Cada lote vira um único bloco de texto.
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = 1000):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def stream(self, fmt: str, **filters) -> Iterator[str]:
+        db = self.session_factory()
+        try:
+            rows = log_event_crud.iter_export(db, batch_size=self.batch_size, **filters)
+            if fmt == "csv":
+                yield from self._csv(rows)
+            else:
+                yield from self._ndjson(rows)
+        finally:
+            db.close()
+
+    def _csv(self, rows) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+        for i, row in enumerate(rows, start=1):
+            writer.writerow(_row_values(row))
+            if i % self.batch_size == 0:
+                yield self._drain(buffer)
+        yield self._drain(buffer)
+
+    def _ndjson(self, rows) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(dict(zip(CSV_HEADER, _row_values(row))), ensure_ascii=False))
+            if len(lines) >= self.batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> str:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+
+log_exporter = LogExporter()
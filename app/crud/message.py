@@ -1,6 +1,13 @@
+from sqlalchemy import tuple_, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.models.message import Message
+from app.core.pagination import decode_cursor
+from app.crud.async_crud import AsyncCRUD
+from app.core.cache import stats_cache
+from app.core.database import after_commit
+from app.core.events import event_broker
 
 
 class MessageCRUD:
@@ -18,9 +25,10 @@ class MessageCRUD:
         skip: int = 0, 
         limit: int = 100,
         user_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Message]:
-        """Lista mensagens com filtros opcionais"""
+        """Lista mensagens com filtros opcionais (cursor: keyset em created_at, id)"""
         query = db.query(Message)
         
         if user_id:
@@ -29,7 +37,12 @@ class MessageCRUD:
         if status:
             query = query.filter(Message.status == status)
         
-        return query.order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
+        if cursor:
+            last_id, last_created_at = decode_cursor(cursor, with_timestamp=True)
+            query = query.filter(tuple_(Message.created_at, Message.id) < (last_created_at, last_id))
+        
+        query = query.order_by(Message.created_at.desc(), Message.id.desc())
+        return query.offset(skip).limit(limit).all()
     
     def create(self, db: Session, message_data: dict, user_id: int) -> Message:
         """Cria nova mensagem"""
@@ -41,21 +54,46 @@ class MessageCRUD:
         )
         
         db.add(message)
-        db.commit()
-        db.refresh(message)
+        db.flush()
+        # Cache e notificação só depois do commit: nada é anunciado se a requisição falhar
+        after_commit(db, stats_cache.invalidate)
+        after_commit(db, lambda: self._publish("MESSAGE_CREATED", message))
         return message
     
-    def update_status(self, db: Session, message_id: int, status: str) -> Optional[Message]:
-        """Atualiza status da mensagem"""
-        message = self.get_by_id(db, message_id)
+    def update_status(self, db: Session, message_id: int, status: str) -> Optional[Row]:
+        """Atualiza status da mensagem com um único UPDATE ... RETURNING (None se não existe)"""
+        message = db.execute(
+            update(Message)
+            .where(Message.id == message_id)
+            .values(status=status)
+            .returning(Message.id, Message.user_id, Message.title, Message.content, Message.status, Message.created_at)
+            .execution_options(synchronize_session=False)
+        ).first()
         if not message:
             return None
         
-        message.status = status
-        db.commit()
-        db.refresh(message)
+        after_commit(db, stats_cache.invalidate)
+        after_commit(db, lambda: self._publish("MESSAGE_STATUS", message))
         return message
+    
+    def _publish(self, event_type: str, message: Message) -> None:
+        """Notifica o dono da mensagem (GET /api/events); sem o conteúdo, para caber no NOTIFY"""
+        event = {
+            "tipo": event_type,
+            "mensagem": {
+                "id": message.id,
+                "userId": message.user_id,
+                "titulo": message.title,
+                "status": message.status,
+                "dataHora": message.created_at.isoformat()
+            }
+        }
+        try:
+            event_broker.publish(message.user_id, event)
+        except Exception as e:
+            # A escrita já foi confirmada (roda após o commit); a notificação é só um atalho para o polling
+            print(f"[events] ERRO ao publicar {event_type} da mensagem {message.id}: {e}")
 
 
 message_crud = MessageCRUD()
-
+async_message_crud = AsyncCRUD(message_crud)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.benefit import Benefit
+from app.models.message import Message
+from app.models.user import User
+from app.crud.async_crud import AsyncCRUD
+
+
+class StatsCRUD:
+    def get_summary(self, db: Session) -> dict:
+        """
+        Resumo do dashboard de RH com três consultas GROUP BY (mensagens por
+        status, benefícios por categoria/status, usuários por papel/ativo)
+        """
+        messages_by_status = dict(
+            db.execute(select(Message.status, func.count()).group_by(Message.status)).all()
+        )
+        
+        benefits_by_status = {}
+        active_benefits_by_category = {}
+        for category, status, count in db.execute(
+            select(Benefit.category, Benefit.status, func.count()).group_by(Benefit.category, Benefit.status)
+        ):
+            benefits_by_status[status] = benefits_by_status.get(status, 0) + count
+            if status == "ATIVO":
+                active_benefits_by_category[category] = count
+        
+        total_users = 0
+        active_users_by_role = {}
+        for role, is_active, count in db.execute(
+            select(User.role, User.is_active, func.count()).group_by(User.role, User.is_active)
+        ):
+            total_users += count
+            if is_active:
+                active_users_by_role[role.value] = count
+        
+        return {
+            "mensagens": {
+                "total": sum(messages_by_status.values()),
+                "pendentes": messages_by_status.get("PENDENTE", 0),
+                "porStatus": messages_by_status,
+            },
+            "beneficios": {
+                "total": sum(benefits_by_status.values()),
+                "ativos": benefits_by_status.get("ATIVO", 0),
+                "porStatus": benefits_by_status,
+                "ativosPorCategoria": active_benefits_by_category,
+            },
+            "usuarios": {
+                "total": total_users,
+                "ativos": sum(active_users_by_role.values()),
+                "ativosPorPapel": active_users_by_role,
+            },
+            # String para o resumo poder ir para o Redis (JSON)
+            "geradoEm": datetime.utcnow().isoformat(),
+        }
+
+
+stats_crud = StatsCRUD()
+async_stats_crud = AsyncCRUD(stats_crud)
@@ -1,7 +1,18 @@
+from datetime import datetime
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from functools import partial
+from typing import Optional, List, Tuple
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash
+from app.core.pagination import decode_cursor
+from app.crud.user_search import user_search
+from app.schemas.serializers import USER_RESPONSE_COLUMNS
+from app.core.cache import stats_cache, user_cache
+from app.core.database import after_commit
+from app.crud.async_crud import AsyncCRUD
 
 
 class UserCRUD:
@@ -17,6 +28,23 @@ class UserCRUD:
         """Busca usuário por username"""
         return db.query(User).filter(User.username == username).first()
     
+    def get_conflict(self, db: Session, email: str, username: str) -> Optional[str]:
+        """
+        Motivo do conflito de cadastro (email ou username já usados), numa única consulta
+
+        Email comparado sem diferenciar maiúsculas (índice ix_users_email_lower).
+        """
+        email = email.lower()
+        existing = db.execute(
+            select(User.email, User.username)
+            .where(or_(func.lower(User.email) == email, User.username == username))
+        ).all()
+        if any(row.email.lower() == email for row in existing):
+            return "Email já cadastrado"
+        if existing:
+            return "Username já cadastrado"
+        return None
+    
     def get_by_username_or_email(self, db: Session, identifier: str) -> Optional[User]:
         """Busca usuário por username ou email"""
         return db.query(User).filter(
@@ -30,10 +58,18 @@ class UserCRUD:
         limit: int = 100,
         role: Optional[str] = None,
         is_active: Optional[bool] = None,
-        search: Optional[str] = None
-    ) -> List[User]:
-        """Lista usuários com filtros opcionais"""
-        query = db.query(User)
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Lista usuários com filtros opcionais
+
+        Com search, os resultados vêm por relevância (ver UserSearch) e a
+        paginação é por skip; sem search, cursor faz keyset em id.
+        Retorna Row só com as colunas da resposta (USER_RESPONSE_COLUMNS),
+        sem carregar password_hash nem montar objetos ORM.
+        """
+        query = db.query(*USER_RESPONSE_COLUMNS)
         
         if role:
             query = query.filter(User.role == role)
@@ -42,85 +78,183 @@ class UserCRUD:
             query = query.filter(User.is_active == is_active)
         
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (User.name.ilike(search_pattern)) |
-                (User.email.ilike(search_pattern)) |
-                (User.username.ilike(search_pattern))
-            )
+            if cursor:
+                raise ValueError("Cursor não é suportado junto com search")
+            query = user_search.apply(query, search)
+        else:
+            if cursor:
+                last_id, _ = decode_cursor(cursor)
+                query = query.filter(User.id > last_id)
+            query = query.order_by(User.id)
         
         return query.offset(skip).limit(limit).all()
     
     def create(self, db: Session, user_data: dict) -> User:
-        """Cria novo usuário"""
-        # Hash da senha
+        """
+        Cria novo usuário
+
+        Email ou username já usados (cadastro concorrente após get_conflict)
+        são barrados pelas constraints UNIQUE: levanta IntegrityError, com a
+        sessão já em rollback.
+
+        Como os demais métodos de escrita, só faz flush: o commit é do
+        chamador (get_db, no fim da requisição).
+        """
+        # Hash da senha (password_hash já calculado pelo chamador, se fornecido)
         password = user_data.pop("senha", None) or user_data.pop("password", None)
-        hashed_password = get_password_hash(password)
+        hashed_password = user_data.pop("password_hash", None) or get_password_hash(password)
         
-        # Mapeamento de campos PT -> EN
-        user_db = User(
-            name=user_data.get("nome") or user_data.get("name"),
-            email=user_data.get("email"),
-            username=user_data.get("username"),
-            password_hash=hashed_password,
-            role=user_data.get("papel", UserRole.COLABORADOR) or user_data.get("role", UserRole.COLABORADOR),
-            cpf=user_data.get("cpf"),
-            phone=user_data.get("telefone") or user_data.get("phone"),
-            bank_name=None,
-            bank_agency=None,
-            bank_account=None,
-            is_active=user_data.get("is_active", True)
-        )
+        user_db = User(**self.user_values(user_data, hashed_password))
+        
+        db.add(user_db)
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            raise
+        after_commit(db, stats_cache.invalidate)
+        return user_db
+    
+    def user_values(self, user_data: dict, hashed_password: str) -> dict:
+        """Mapeamento de campos PT -> EN (colunas de users)"""
+        values = {
+            "name": user_data.get("nome") or user_data.get("name"),
+            "email": user_data.get("email"),
+            "username": user_data.get("username"),
+            "password_hash": hashed_password,
+            "role": UserRole(user_data.get("papel", UserRole.COLABORADOR) or user_data.get("role", UserRole.COLABORADOR)),
+            "cpf": user_data.get("cpf"),
+            "phone": user_data.get("telefone") or user_data.get("phone"),
+            "bank_name": None,
+            "bank_agency": None,
+            "bank_account": None,
+            "is_active": user_data.get("is_active", True)
+        }
         
         # Dados bancários se fornecidos
         dados_bancarios = user_data.get("dadosBancarios")
         if dados_bancarios:
-            user_db.bank_name = dados_bancarios.get("banco")
-            user_db.bank_agency = dados_bancarios.get("agencia")
-            user_db.bank_account = dados_bancarios.get("conta")
+            values["bank_name"] = dados_bancarios.get("banco")
+            values["bank_agency"] = dados_bancarios.get("agencia")
+            values["bank_account"] = dados_bancarios.get("conta")
+        return values
+    
+    def bulk_create(self, db: Session, rows: List[Tuple[int, dict]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Cria um lote de usuários com um único INSERT multi-linha
+
+        rows: (número da linha, dados com password_hash já calculado).
+        Email/username já cadastrados são verificados com uma consulta IN por
+        coluna (email sem diferenciar maiúsculas, como a deduplicação do
+        arquivo). Retorna (quantidade criada, [(linha, erro), ...]).
+        """
+        emails = {data["email"].lower() for _, data in rows}
+        usernames = {data["username"] for _, data in rows}
+        existing_emails = set(db.scalars(
+            select(func.lower(User.email)).where(func.lower(User.email).in_(emails))
+        ))
+        existing_usernames = set(db.scalars(select(User.username).where(User.username.in_(usernames))))
         
-        db.add(user_db)
-        db.commit()
-        db.refresh(user_db)
-        return user_db
+        errors = []
+        to_insert = []
+        now = datetime.utcnow()
+        for line, data in rows:
+            if data["email"].lower() in existing_emails:
+                errors.append((line, "Email já cadastrado"))
+            elif data["username"] in existing_usernames:
+                errors.append((line, "Username já cadastrado"))
+            else:
+                values = self.user_values(data, data["password_hash"])
+                values["created_at"] = values["updated_at"] = now
+                to_insert.append((line, values))
+        
+        if not to_insert:
+            return 0, errors
+        
+        after_commit(db, stats_cache.invalidate)
+        try:
+            # SAVEPOINT: um conflito desfaz só este lote, não a transação inteira
+            with db.begin_nested():
+                db.execute(insert(User).values([values for _, values in to_insert]))
+            return len(to_insert), errors
+        except IntegrityError:
+            # Cadastro concorrente entre a verificação e o INSERT: refaz linha a linha
+            pass
+        
+        created = 0
+        for line, values in to_insert:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(User).values(values))
+                created += 1
+            except IntegrityError:
+                errors.append((line, "Email ou username já cadastrado"))
+        return created, errors
     
-    def update(self, db: Session, user_id: int, user_data: dict) -> Optional[User]:
-        """Atualiza usuário"""
-        user = self.get_by_id(db, user_id)
-        if not user:
-            return None
+    def update(self, db: Session, user_id: int, user_data: dict) -> Optional[Row]:
+        """
+        Atualiza usuário com um único UPDATE ... RETURNING
+
+        Retorna Row com USER_RESPONSE_COLUMNS (None se o usuário não existe).
+        """
+        values = {}
         
         # Atualizar campos básicos
         if "nome" in user_data:
-            user.name = user_data["nome"]
+            values["name"] = user_data["nome"]
         if "email" in user_data:
-            user.email = user_data["email"]
+            values["email"] = user_data["email"]
         if "telefone" in user_data:
-            user.phone = user_data["telefone"]
+            values["phone"] = user_data["telefone"]
         
         # Atualizar dados bancários
         if "dadosBancarios" in user_data:
             dados = user_data["dadosBancarios"]
             if dados:
-                user.bank_name = dados.get("banco")
-                user.bank_agency = dados.get("agencia")
-                user.bank_account = dados.get("conta")
+                values["bank_name"] = dados.get("banco")
+                values["bank_agency"] = dados.get("agencia")
+                values["bank_account"] = dados.get("conta")
         
-        db.commit()
-        db.refresh(user)
+        if not values:
+            return db.execute(select(*USER_RESPONSE_COLUMNS).where(User.id == user_id)).first()
+        
+        user = db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(*USER_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+        after_commit(db, partial(user_cache.invalidate, user_id))
         return user
     
-    def update_role(self, db: Session, user_id: int, role: str) -> Optional[User]:
-        """Atualiza papel do usuário"""
-        user = self.get_by_id(db, user_id)
-        if not user:
-            return None
-        
+    def update_role(self, db: Session, user: User, role: str) -> User:
+        """Atualiza papel do usuário (já carregado pelo chamador, que precisa do papel antigo)"""
         user.role = UserRole(role)
-        db.commit()
-        db.refresh(user)
+        db.flush()
+        after_commit(db, partial(user_cache.invalidate, user.id))
+        after_commit(db, stats_cache.invalidate)
+        return user
+    
+    def update_password_hash(self, db: Session, user: User, password_hash: str) -> User:
+        """Substitui o hash da senha (rehash transparente no login)"""
+        user.password_hash = password_hash
+        db.flush()
+        return user
+    
+    def set_active(self, db: Session, user_id: int, is_active: bool) -> Optional[Row]:
+        """Ativa ou desativa usuário (UPDATE ... RETURNING; None se não existe)"""
+        user = db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(is_active=is_active)
+            .returning(*USER_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+        after_commit(db, partial(user_cache.invalidate, user_id))
+        after_commit(db, stats_cache.invalidate)
         return user
 
 
 user_crud = UserCRUD()
-
+async_user_crud = AsyncCRUD(user_crud)
@@ -0,0 +1,227 @@
+import csv
+import json
+from typing import IO, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import DBSession
+from app.core.security import ahash_passwords_bulk, hash_passwords_bulk
+from app.crud.async_crud import AsyncCRUD
+from app.crud.user import user_crud
+from app.schemas.user import UserImportRow
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+ENCODING_ERROR = "Linha não está em UTF-8 (salve o arquivo como CSV UTF-8)"
+
+# Colunas do CSV (cabeçalho obrigatório); dados bancários e papel são opcionais
+CSV_COLUMNS = ("nome", "email", "username", "senha", "cpf", "telefone", "papel", "banco", "agencia", "conta")
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Formato pela extensão do arquivo (.csv, .jsonl/.ndjson)"""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+class ImportFileError(ValueError):
+    """Arquivo que não pode ser importado de forma alguma (ex.: cabeçalho ilegível)"""
+
+
+def _decoded_lines(fileobj: IO[bytes], bad_lines: List[int]) -> Iterator[str]:
+    # Lê linha a linha do arquivo enviado (nunca o arquivo inteiro). Linha que
+    # não é UTF-8 (planilha exportada em Latin-1/Windows-1252) vira linha
+    # vazia, para não quebrar a contagem, e seu número vai para bad_lines.
+    for line_number, raw in enumerate(fileobj, start=1):
+        try:
+            yield raw.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            bad_lines.append(line_number)
+            yield "\n"
+
+
+def _encoding_errors(bad_lines: List[int]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    while bad_lines:
+        yield bad_lines.pop(0), None, ENCODING_ERROR
+
+
+def _csv_row_to_data(row: dict) -> dict:
+    values = {key: (value or "").strip() for key, value in row.items() if key in CSV_COLUMNS}
+    data = {
+        key: values.get(key, "")
+        for key in ("nome", "email", "username", "senha", "cpf", "telefone")
+    }
+    if values.get("papel"):
+        data["papel"] = values["papel"].upper()
+    if any(values.get(key) for key in ("banco", "agencia", "conta")):
+        data["dadosBancarios"] = {key: values.get(key) or None for key in ("banco", "agencia", "conta")}
+    return data
+
+
+def iter_rows(fileobj: IO[bytes], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Percorre o arquivo gerando (linha, dados, erro de leitura)"""
+    bad_lines: List[int] = []
+    if fmt == "csv":
+        reader = csv.DictReader(_decoded_lines(fileobj, bad_lines))
+        if reader.fieldnames is not None and 1 in bad_lines:
+            raise ImportFileError("Cabeçalho do CSV não está em UTF-8 (salve o arquivo como CSV UTF-8)")
+        for row in reader:
+            yield from _encoding_errors(bad_lines)
+            if not any(row.values()):
+                continue
+            yield reader.line_num, _csv_row_to_data(row), None
+        yield from _encoding_errors(bad_lines)
+        return
+    for line_number, line in enumerate(_decoded_lines(fileobj, bad_lines), start=1):
+        yield from _encoding_errors(bad_lines)
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None, "JSON inválido"
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, "Linha deve ser um objeto JSON"
+            continue
+        yield line_number, data, None
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
+
+
+class _ImportReport:
+    """Contagens e erros (por linha) de uma importação"""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.total = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"linha": line, "erro": message})
+
+    def add_written(self, inserted: int, chunk_errors: List[Tuple[int, str]]) -> None:
+        self.created += inserted
+        for line, message in chunk_errors:
+            self.add_error(line, message)
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total,
+            "importados": self.created,
+            "erros": self.error_count,
+            "detalhesErros": sorted(self.errors, key=lambda e: e["linha"]),
+        }
+
+
+def _take_passwords(chunk: List[Tuple[int, dict]]) -> List[str]:
+    return [data.pop("senha") for _, data in chunk]
+
+
+def _set_hashes(chunk: List[Tuple[int, dict]], hashes: List[str]) -> None:
+    for (_, data), password_hash in zip(chunk, hashes):
+        data["password_hash"] = password_hash
+
+
+class UserImporter:
+    """
+    Importação em massa de usuários a partir de CSV ou JSONL.
+
+    O arquivo é lido em streaming e processado em lotes de chunk_size linhas:
+    cada linha é validada (UserImportRow), emails/usernames repetidos no
+    próprio arquivo são recusados, as senhas do lote são hasheadas em paralelo
+    e o lote é gravado com um INSERT multi-linha (UserCRUD.bulk_create).
+    Linhas com erro não interrompem a importação; são relatadas por número.
+    Diferente das escritas comuns, cada lote é confirmado (commit) assim que
+    gravado, para que arquivos grandes não virem uma transação gigante.
+
+    run() é a versão síncrona (scripts, benchmarks); as rotas usam arun().
+    """
+
+    def __init__(self, chunk_size: int = 500, max_errors: int = 1000):
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    def run(self, db: Session, fileobj: IO[bytes], fmt: str) -> dict:
+        report = _ImportReport(self.max_errors)
+        for chunk in self.iter_chunks(fileobj, fmt, report):
+            _set_hashes(chunk, hash_passwords_bulk(_take_passwords(chunk)))
+            report.add_written(*self.write_chunk(db, chunk))
+        return report.summary()
+
+    async def arun(self, db: DBSession, fileobj: IO[bytes], fmt: str) -> dict:
+        """
+        Como run(), sem bloquear o event loop em nenhuma etapa: a leitura e a
+        validação de cada lote rodam no threadpool, os hashes no pool de
+        bcrypt da importação e só a gravação do lote (INSERT + commit) passa
+        pela sessão, via AsyncCRUD (run_sync com DB_ASYNC=true).
+        """
+        report = _ImportReport(self.max_errors)
+        chunks = self.iter_chunks(fileobj, fmt, report)
+        writer = AsyncCRUD(self)
+        while True:
+            chunk = await run_in_threadpool(next, chunks, None)
+            if chunk is None:
+                break
+            _set_hashes(chunk, await ahash_passwords_bulk(_take_passwords(chunk)))
+            report.add_written(*await writer.write_chunk(db, chunk))
+        return report.summary()
+
+    def iter_chunks(self, fileobj: IO[bytes], fmt: str, report: _ImportReport) -> Iterator[List[Tuple[int, dict]]]:
+        """Lotes de até chunk_size linhas válidas (linha, dados); os erros vão para report"""
+        seen_emails = set()
+        seen_usernames = set()
+        chunk: List[Tuple[int, dict]] = []
+
+        for line, data, read_error in iter_rows(fileobj, fmt):
+            report.total += 1
+            if read_error:
+                report.add_error(line, read_error)
+                continue
+            try:
+                row = UserImportRow(**data)
+            except ValidationError as e:
+                report.add_error(line, _validation_message(e))
+                continue
+            email = row.email.lower()
+            if email in seen_emails:
+                report.add_error(line, "Email repetido no arquivo")
+                continue
+            if row.username in seen_usernames:
+                report.add_error(line, "Username repetido no arquivo")
+                continue
+            seen_emails.add(email)
+            seen_usernames.add(row.username)
+
+            chunk.append((line, row.model_dump(exclude_none=True)))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def write_chunk(self, db: Session, chunk: List[Tuple[int, dict]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """Grava um lote já com password_hash e confirma; retorna (inseridos, erros por linha)"""
+        result = user_crud.bulk_create(db, chunk)
+        db.commit()
+        return result
+
+
+user_importer = UserImporter(
+    chunk_size=settings.IMPORT_CHUNK_SIZE,
+    max_errors=settings.IMPORT_MAX_ERRORS,
+)
@@ -0,0 +1,127 @@
+import re
+import unicodedata
+from sqlalchemy import Float, Integer, false, func, literal_column, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+from app.models.user import User
+
+# DDL do SQLite (FTS5): tabela de conteúdo externo sincronizada por triggers
+_SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        name, email, username,
+        content='users', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, name, email, username) VALUES (new.id, new.name, new.email, new.username);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email, username) VALUES ('delete', old.id, old.name, old.email, old.username);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email, username) VALUES ('delete', old.id, old.name, old.email, old.username);
+        INSERT INTO users_fts(rowid, name, email, username) VALUES (new.id, new.name, new.email, new.username);
+    END""",
+]
+# Indexa os usuários que já existem; só quando users_fts acaba de ser criada
+# (depois disso os triggers mantêm o índice em dia)
+_SQLITE_FTS_REBUILD = "INSERT INTO users_fts(users_fts) VALUES ('rebuild')"
+
+
+def normalize_search(value: str) -> str:
+    """Minúsculas e sem acentos (José -> jose), como f_unaccent(lower(...)) no PostgreSQL"""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def pg_search_document():
+    """
+    Expressão indexada por ix_users_search_trgm (migração 0002). Precisa ser
+    idêntica à do índice, por isso o separador é literal e não parâmetro.
+    """
+    sep = literal_column("' '")
+    return func.f_unaccent(func.lower(User.name.op("||")(sep).op("||")(User.email).op("||")(sep).op("||")(User.username)))
+
+
+class UserSearch:
+    """
+    Busca de usuários por nome, email ou username, ordenada por relevância e
+    sem diferenciar acentos.
+
+    O backend é escolhido em setup() conforme o banco:
+    - trigram: PostgreSQL com pg_trgm + unaccent (migração 0002), índice GIN
+    - fts5: SQLite com FTS5 (desenvolvimento/testes locais)
+    - like: ILIKE '%termo%' sem índice (fallback)
+    """
+
+    def __init__(self):
+        self.backend = "like"
+
+    def setup(self, engine: Engine) -> str:
+        """Detecta (PostgreSQL) ou cria (SQLite) a estrutura de busca"""
+        dialect = engine.dialect.name
+        try:
+            with engine.begin() as conn:
+                if dialect == "postgresql":
+                    available = conn.execute(text(
+                        "SELECT to_regprocedure('f_unaccent(text)') IS NOT NULL"
+                        " AND to_regclass('ix_users_search_trgm') IS NOT NULL"
+                    )).scalar()
+                    self.backend = "trigram" if available else "like"
+                elif dialect == "sqlite":
+                    created = conn.execute(text(
+                        "SELECT NOT EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts')"
+                    )).scalar()
+                    for ddl in _SQLITE_FTS_DDL:
+                        conn.execute(text(ddl))
+                    if created:
+                        conn.execute(text(_SQLITE_FTS_REBUILD))
+                    self.backend = "fts5"
+        except Exception as e:
+            print(f"[search] Busca indexada indisponível, usando ILIKE: {e}")
+            self.backend = "like"
+        if self.backend == "like" and dialect == "postgresql":
+            print("[search] Índice de busca não encontrado; rode `alembic upgrade head` para habilitá-lo")
+        return self.backend
+
+    def apply(self, query: Query, search: str) -> Query:
+        """Filtra a consulta de User pelo termo e ordena por relevância"""
+        if self.backend == "trigram":
+            return self._apply_trigram(query, search)
+        if self.backend == "fts5":
+            return self._apply_fts5(query, search)
+        return self._apply_like(query, search)
+
+    def _apply_trigram(self, query: Query, search: str) -> Query:
+        term = normalize_search(search)
+        document = pg_search_document()
+        return query.filter(
+            document.like(f"%{_escape_like(term)}%", escape="\\")
+        ).order_by(func.word_similarity(term, document).desc(), User.id)
+
+    def _apply_fts5(self, query: Query, search: str) -> Query:
+        tokens = re.findall(r"\w+", normalize_search(search))
+        if not tokens:
+            # Só pontuação: nada a procurar, como nos outros backends
+            return query.filter(false())
+        # Cada termo como prefixo ("mar"* casa com "maria"), todos obrigatórios
+        match = " ".join(f'"{token}"*' for token in tokens)
+        fts = text(
+            "SELECT rowid AS id, bm25(users_fts) AS rank FROM users_fts WHERE users_fts MATCH :match"
+        ).bindparams(match=match).columns(id=Integer, rank=Float).subquery("users_fts_match")
+        return query.join(fts, fts.c.id == User.id).order_by(fts.c.rank, User.id)
+
+    def _apply_like(self, query: Query, search: str) -> Query:
+        search_pattern = f"%{search}%"
+        return query.filter(
+            (User.name.ilike(search_pattern)) |
+            (User.email.ilike(search_pattern)) |
+            (User.username.ilike(search_pattern))
+        ).order_by(User.id)
+
+
+user_search = UserSearch()
@@ -0,0 +1,238 @@
+"""
+Gerador de massa de dados sintética para testes de desempenho.
+
+Uso:
+    python -m app.generate_data --users 100000 --logs 1000000
+
+Cria N usuários (todos com a mesma senha, hasheada uma vez) e, em proporção,
+benefícios, mensagens e logs espalhados pelos últimos --months meses. No
+PostgreSQL os lotes são gravados com COPY; nos demais bancos, com INSERT em
+lote (executemany). Cada execução usa um prefixo próprio de username/email,
+então pode ser repetida sobre um banco que já tem dados.
+"""
+import argparse
+import csv
+import io
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence
+from sqlalchemy import Table, select
+from sqlalchemy.orm import Session
+from app.core.cache import stats_cache
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models.benefit import Benefit
+from app.models.log_event import LogEvent
+from app.models.message import Message
+from app.models.user import User
+
+FIRST_NAMES = [
+    "Maria", "José", "Ana", "João", "Antônio", "Francisca", "Carlos", "Paulo", "Adriana", "Lúcia",
+    "Márcio", "Fernanda", "Luís", "Patrícia", "Sebastião", "Juliana", "Cláudio", "Letícia", "André", "Conceição",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Conceição", "Ribeiro", "Araújo", "Carvalho", "Gonçalves", "Magalhães", "Brandão", "Simões", "Assunção", "Guimarães",
+]
+BANKS = ["Banco do Brasil", "Itaú", "Bradesco", "Santander", "Caixa Econômica", "Nubank"]
+# (papel, peso)
+ROLES = [("COLABORADOR", 90), ("GESTOR_RH", 8), ("ADMIN", 2)]
+BENEFIT_CATALOG = [
+    ("Vale Refeição", "ALIMENTACAO", "R$ 1.200,00/mês", "Vale refeição para alimentação diária"),
+    ("Vale Alimentação", "ALIMENTACAO", "R$ 800,00/mês", "Crédito mensal para supermercado"),
+    ("Plano de Saúde", "SAUDE", "Cobertura completa", "Plano de saúde empresarial com cobertura nacional"),
+    ("Plano Odontológico", "SAUDE", "Cobertura completa", "Plano odontológico empresarial"),
+    ("Vale Transporte", "OUTROS", "R$ 300,00/mês", "Vale transporte para deslocamento"),
+    ("Auxílio Home Office", "OUTROS", "R$ 150,00/mês", "Auxílio para custos de trabalho remoto"),
+    ("Auxílio Educação", "OUTROS", "R$ 800,00/mês", "Auxílio para cursos e capacitações"),
+    ("Seguro de Vida", "OUTROS", "Cobertura de R$ 500.000", "Seguro de vida em grupo"),
+]
+MESSAGE_TITLES = [
+    "Dúvida sobre Vale Refeição", "Atualização de dados bancários", "Solicitação de auxílio home office",
+    "Reembolso de plano de saúde", "Inclusão de dependente", "Dúvida sobre férias",
+]
+MESSAGE_STATUSES = [("PENDENTE", 50), ("EM_ANALISE", 20), ("RESPONDIDA", 30)]
+# (tipo, peso) na proporção observada em produção: logins dominam
+EVENT_TYPES = [("LOGIN", 70), ("LOGOUT", 15), ("UPDATE_DATA", 8), ("NEW_MESSAGE", 5), ("CHANGE_ROLE", 2)]
+
+
+def _weighted(rng: random.Random, options) -> str:
+    values, weights = zip(*options)
+    return rng.choices(values, weights)[0]
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkWriter:
+    """Grava linhas em lotes: COPY no PostgreSQL, executemany nos demais"""
+
+    def __init__(self, db: Session, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.use_copy = db.get_bind().dialect.name == "postgresql"
+
+    def write(self, table: Table, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        total = 0
+        started = time.perf_counter()
+        for batch in _batches(rows, self.batch_size):
+            if self.use_copy:
+                self._copy(table, columns, batch)
+            else:
+                self.db.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+            self.db.commit()
+            total += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"  - {table.name}: {total} linhas em {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} linhas/s)")
+        return total
+
+    def _copy(self, table: Table, columns: Sequence[str], batch: List[tuple]) -> None:
+        buffer = io.StringIO()
+        # No formato CSV do COPY, campo vazio sem aspas é NULL (None -> "")
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+
+class SyntheticDataGenerator:
+    def __init__(
+        self,
+        db: Session,
+        users: int,
+        benefits_per_user: float = 3,
+        messages_per_user: float = 2,
+        logs: int = 0,
+        months: int = 12,
+        password: str = "123456",
+        batch_size: int = 10000,
+        seed: int = 42,
+    ):
+        self.db = db
+        self.users = users
+        self.benefits_per_user = benefits_per_user
+        self.messages_per_user = messages_per_user
+        self.logs = logs or users * 10
+        self.months = months
+        self.password = password
+        self.writer = BulkWriter(db, batch_size)
+        self.rng = random.Random(seed)
+        self.prefix = f"s{uuid.uuid4().hex[:6]}"
+        self.now = datetime.utcnow()
+
+    def run(self) -> dict:
+        print(f"Gerando dados sintéticos (prefixo {self.prefix})...")
+        # Uma senha para todos: um único hash bcrypt
+        password_hash = get_password_hash(self.password)
+        counts = {"users": self.writer.write(User.__table__, USER_COLUMNS, self._users(password_hash))}
+
+        user_ids = self.db.scalars(
+            select(User.id).where(User.username.like(f"{self.prefix}.%")).order_by(User.id)
+        ).all()
+        counts["benefits"] = self.writer.write(Benefit.__table__, BENEFIT_COLUMNS, self._benefits(user_ids))
+        counts["messages"] = self.writer.write(Message.__table__, MESSAGE_COLUMNS, self._messages(user_ids))
+        counts["log_events"] = self.writer.write(LogEvent.__table__, LOG_COLUMNS, self._logs(user_ids))
+        stats_cache.invalidate()
+        return counts
+
+    def _timestamp(self) -> datetime:
+        return self.now - timedelta(seconds=self.rng.uniform(0, self.months * 30 * 86400))
+
+    def _users(self, password_hash: str) -> Iterator[tuple]:
+        rng = self.rng
+        for i in range(self.users):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+            username = f"{self.prefix}.{i}"
+            created_at = self._timestamp()
+            yield (
+                name, f"{username}@exemplo.com.br", username, password_hash, _weighted(rng, ROLES),
+                f"{rng.randrange(10**11):011d}", f"(11) 9{rng.randrange(10**8):08d}",
+                rng.choice(BANKS), f"{rng.randrange(10000):04d}", f"{rng.randrange(10**6):06d}",
+                rng.random() > 0.05, created_at, created_at,
+            )
+
+    def _per_user(self, average: float) -> int:
+        # Quantidade por usuário variando em torno da média
+        return max(0, round(self.rng.gauss(average, average / 3)))
+
+    def _benefits(self, user_ids: Sequence[int]) -> Iterator[tuple]:
+        rng = self.rng
+        for user_id in user_ids:
+            count = min(self._per_user(self.benefits_per_user), len(BENEFIT_CATALOG))
+            for name, category, value, description in rng.sample(BENEFIT_CATALOG, count):
+                status = "ATIVO" if rng.random() > 0.1 else "SUSPENSO"
+                yield (user_id, name, category, status, value, description)
+
+    def _messages(self, user_ids: Sequence[int]) -> Iterator[tuple]:
+        rng = self.rng
+        for user_id in user_ids:
+            for _ in range(self._per_user(self.messages_per_user)):
+                title = rng.choice(MESSAGE_TITLES)
+                created_at = self._timestamp()
+                yield (
+                    user_id, title, f"{title}: mensagem gerada para testes de carga.",
+                    _weighted(rng, MESSAGE_STATUSES), created_at, created_at,
+                )
+
+    def _logs(self, user_ids: Sequence[int]) -> Iterator[tuple]:
+        rng = self.rng
+        for _ in range(self.logs):
+            user_id = rng.choice(user_ids) if rng.random() > 0.02 else None
+            event_type = _weighted(rng, EVENT_TYPES)
+            yield (user_id, event_type, f"{event_type} (gerado)", self._timestamp())
+
+
+USER_COLUMNS = (
+    "name", "email", "username", "password_hash", "role", "cpf", "phone",
+    "bank_name", "bank_agency", "bank_account", "is_active", "created_at", "updated_at",
+)
+BENEFIT_COLUMNS = ("user_id", "name", "category", "status", "value", "description")
+MESSAGE_COLUMNS = ("user_id", "title", "content", "status", "created_at", "updated_at")
+LOG_COLUMNS = ("user_id", "event_type", "description", "created_at")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera massa de dados sintética para testes de desempenho")
+    parser.add_argument("--users", type=int, required=True, help="quantidade de usuários")
+    parser.add_argument("--benefits-per-user", type=float, default=3, help="média de benefícios por usuário")
+    parser.add_argument("--messages-per-user", type=float, default=2, help="média de mensagens por usuário")
+    parser.add_argument("--logs", type=int, default=0, help="quantidade de logs (padrão: 10 por usuário)")
+    parser.add_argument("--months", type=int, default=12, help="meses cobertos pelas datas geradas")
+    parser.add_argument("--password", default="123456", help="senha de todos os usuários gerados")
+    parser.add_argument("--batch-size", type=int, default=10000, help="linhas por lote (COPY/INSERT)")
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador aleatório")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        counts = SyntheticDataGenerator(
+            db,
+            users=args.users,
+            benefits_per_user=args.benefits_per_user,
+            messages_per_user=args.messages_per_user,
+            logs=args.logs,
+            months=args.months,
+            password=args.password,
+            batch_size=args.batch_size,
+            seed=args.seed,
+        ).run()
+        print(f"Concluído em {time.perf_counter() - started:.1f}s: {counts}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
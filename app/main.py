@@ -1,15 +1,28 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import engine, SessionLocal, Base
-from app.api.routes import auth, users, benefits, messages, logs
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import ETAG_HEADER
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.core.security import PasswordHasherBusy
+from app.core.audit import audit_log
+from app.core.health import db_init_state, readiness
+from app.core.log_retention import log_retention
+from app.core.events import event_broker
+from app.api.routes import auth, users, benefits, messages, logs, stats, events
+from app.api.middleware import MetricsMiddleware, QueryProfilerMiddleware
 from app.seed import seed_database
+from app.crud.user_search import user_search
 
 # Criar aplicação FastAPI
 app = FastAPI(
     title="Portal de Benefícios do Colaborador API",
     description="API Backend para o Portal de Benefícios do Colaborador (PBC)",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson: serialização JSON bem mais rápida que a da stdlib
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
@@ -19,8 +32,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
+# Perfil de SQL por requisição (opcional); fica dentro do MetricsMiddleware
+if settings.QUERY_PROFILER:
+    app.add_middleware(QueryProfilerMiddleware, repeat_threshold=settings.QUERY_PROFILER_REPEAT_THRESHOLD)
+
+# Métricas por rota (servidas em /metrics)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Pool de bcrypt saturado: pedir ao cliente que tente de novo"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servidor ocupado, tente novamente em instantes"},
+        headers={"Retry-After": "1"},
+    )
+
 
 def _run_db_init():
     """Cria tabelas e executa seed em background (não bloqueia o server)."""
@@ -28,6 +59,7 @@ def _run_db_init():
     from sqlalchemy.exc import OperationalError
 
     print("Iniciando aplicação (init do banco em background)...")
+    db_init_state.set("running")
     last_error = None
     max_retries = 10
     for attempt in range(1, max_retries + 1):
@@ -41,16 +73,30 @@ def _run_db_init():
                 print("  Dica: no Railway, defina DATABASE_URL (variável do plugin PostgreSQL ou referência ao serviço).")
                 detail = getattr(e, "orig", e)
                 print(f"  Detalhe: {detail}")
+                db_init_state.set("failed", "não foi possível conectar ao banco")
                 return
             print(f"Aguardando banco de dados... tentativa {attempt}/{max_retries}")
             time.sleep(2)
 
+    print(f"Busca de usuários: {user_search.setup(engine)}")
+    try:
+        created = log_retention.ensure_partitions()
+        if created:
+            print(f"Partições de log_events criadas: {', '.join(created)}")
+    except Exception as e:
+        print(f"[retention] ERRO ao criar partições de log_events: {e}")
+    log_retention.start_partition_maintenance(settings.LOG_PARTITION_CHECK_INTERVAL_SECONDS)
+
     print("Verificando necessidade de seed...")
     db = SessionLocal()
     try:
         seed_database(db)
+    except Exception as e:
+        db_init_state.set("failed", f"seed: {e}")
+        raise
     finally:
         db.close()
+    db_init_state.set("done")
     print("Aplicação iniciada com sucesso!")
 
 
@@ -67,6 +113,16 @@ def startup_event():
     import threading
     thread = threading.Thread(target=_run_db_init, daemon=True)
     thread.start()
+    audit_log.start()
+    event_broker.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Grava os logs de auditoria ainda na fila e encerra as threads de fundo"""
+    audit_log.stop()
+    event_broker.stop()
+    log_retention.stop_partition_maintenance()
 
 
 # Incluir routers
@@ -75,6 +131,8 @@ app.include_router(users.router, prefix="/api/users", tags=["Usuários"])
 app.include_router(benefits.router, prefix="/api/benefits", tags=["Benefícios"])
 app.include_router(messages.router, prefix="/api/messages", tags=["Mensagens"])
 app.include_router(logs.router, prefix="/api/logs", tags=["Logs"])
+app.include_router(stats.router, prefix="/api/stats", tags=["Estatísticas"])
+app.include_router(events.router, prefix="/api/events", tags=["Eventos"])
 
 
 @app.get("/")
@@ -90,6 +148,23 @@ def root():
 
 @app.get("/health")
 def health_check():
-    """Endpoint de health check"""
+    """Endpoint de health check (liveness: só indica que o processo responde)"""
     return {"status": "healthy"}
 
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness: pronto para receber tráfego só quando o init do banco terminou,
+    o banco responde (SELECT 1 em cache) e o pool de conexões não está esgotado
+    """
+    result = await readiness()
+    status_code = status.HTTP_200_OK if result["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=result)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas no formato texto do Prometheus (rotas, consultas SQL, pool, auditoria)"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
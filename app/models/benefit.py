@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class Benefit(Base):
     __tablename__ = "benefits"
+    # Índices no formato de BenefitCRUD.get_multi/get_by_user_id (ORDER BY id)
+    __table_args__ = (
+        Index("ix_benefits_user_id", "user_id", "id"),
+        Index("ix_benefits_category_status", "category", "status", "id"),
+        Index("ix_benefits_status", "status", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -6,6 +6,14 @@ from app.core.database import Base
 
 class LogEvent(Base):
     __tablename__ = "log_events"
+    # Índices no formato das consultas de LogEventCRUD.get_multi:
+    # filtro opcional + ORDER BY created_at DESC, id DESC
+    # No PostgreSQL a tabela é particionada por mês em created_at (migração 0003)
+    __table_args__ = (
+        Index("ix_log_events_created_at_id", "created_at", "id"),
+        Index("ix_log_events_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_log_events_event_type_created_at", "event_type", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -6,6 +6,12 @@ from app.core.database import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    # Índices no formato de MessageCRUD.get_multi (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (
+        Index("ix_messages_created_at_id", "created_at", "id"),
+        Index("ix_messages_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_messages_status_created_at", "status", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, Enum as SQLEnum, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -34,3 +34,6 @@ class User(Base):
     messages = relationship("Message", back_populates="user")
     log_events = relationship("LogEvent", back_populates="user")
 
+
+# Conflito de email no cadastro/importação ignora maiúsculas (lower(email) = ...)
+Index("ix_users_email_lower", func.lower(User.email))
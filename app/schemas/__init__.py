@@ -1,16 +1,22 @@
 from app.schemas.user import (
     UserBase, UserCreate, UserUpdate, UserResponse, UserLogin,
-    DadosBancarios, UserRoleUpdate
+    DadosBancarios, UserRoleUpdate, UserImportRow, UserImportError, UserImportResult
+)
+from app.schemas.benefit import (
+    BenefitBase, BenefitCreate, BenefitResponse,
+    BenefitBulkAssign, BenefitBulkStatusUpdate, BenefitBulkResult
 )
-from app.schemas.benefit import BenefitBase, BenefitCreate, BenefitResponse
 from app.schemas.message import MessageBase, MessageCreate, MessageUpdate, MessageResponse
 from app.schemas.log_event import LogEventBase, LogEventResponse
+from app.schemas.stats import MessageStats, BenefitStats, UserStats, StatsResponse
 
 __all__ = [
     "UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
-    "DadosBancarios", "UserRoleUpdate",
+    "DadosBancarios", "UserRoleUpdate", "UserImportRow", "UserImportError", "UserImportResult",
     "BenefitBase", "BenefitCreate", "BenefitResponse",
+    "BenefitBulkAssign", "BenefitBulkStatusUpdate", "BenefitBulkResult",
     "MessageBase", "MessageCreate", "MessageUpdate", "MessageResponse",
-    "LogEventBase", "LogEventResponse"
+    "LogEventBase", "LogEventResponse",
+    "MessageStats", "BenefitStats", "UserStats", "StatsResponse"
 ]
 
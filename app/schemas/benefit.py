@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class BenefitBase(BaseModel):
@@ -14,6 +14,33 @@ class BenefitCreate(BenefitBase):
     userId: int
 
 
+class BenefitBulkAssign(BaseModel):
+    """Concessão de um benefício a todos os usuários que atendem aos filtros"""
+    nome: str
+    categoria: str
+    status: Literal["ATIVO", "SUSPENSO"] = "ATIVO"
+    valor: Optional[str] = None
+    descricao: Optional[str] = None
+    # Filtros dos usuários contemplados
+    papel: Optional[Literal["COLABORADOR", "GESTOR_RH", "ADMIN"]] = None
+    userIds: Optional[List[int]] = None
+    apenasAtivos: bool = True
+    # Não duplica o benefício (mesmo nome) para quem já o possui
+    ignorarExistentes: bool = True
+
+
+class BenefitBulkStatusUpdate(BaseModel):
+    """Mudança de status de todos os benefícios que atendem aos filtros"""
+    status: Literal["ATIVO", "SUSPENSO"]
+    categoria: Optional[str] = None
+    nome: Optional[str] = None
+    userIds: Optional[List[int]] = None
+
+
+class BenefitBulkResult(BaseModel):
+    afetados: int
+
+
 class BenefitResponse(BenefitBase):
     id: int
     userId: int
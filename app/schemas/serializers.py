@@ -0,0 +1,89 @@
+"""
+Conversão de linhas do banco para o formato de resposta da API (PT-BR).
+
+As funções aceitam tanto objetos ORM quanto Row de select() com só as
+colunas listadas em *_RESPONSE_COLUMNS, já que ambos expõem os campos como
+atributos. Os campos são lidos de uma vez por um attrgetter montado na
+importação do módulo.
+"""
+from operator import attrgetter
+from app.models.benefit import Benefit
+from app.models.log_event import LogEvent
+from app.models.message import Message
+from app.models.user import User
+
+# Colunas necessárias para user_to_response (sem password_hash e datas)
+USER_RESPONSE_COLUMNS = (
+    User.id, User.name, User.email, User.username, User.cpf, User.role, User.phone,
+    User.is_active, User.bank_name, User.bank_agency, User.bank_account,
+)
+
+BENEFIT_RESPONSE_COLUMNS = (
+    Benefit.id, Benefit.user_id, Benefit.name, Benefit.category, Benefit.status,
+    Benefit.value, Benefit.description,
+)
+
+_user_fields = attrgetter(*(column.key for column in USER_RESPONSE_COLUMNS))
+_benefit_fields = attrgetter(*(column.key for column in BENEFIT_RESPONSE_COLUMNS))
+_message_fields = attrgetter("id", "user_id", "title", "content", "status", "created_at")
+
+
+def user_to_response(user) -> dict:
+    """Converte User (ou Row com USER_RESPONSE_COLUMNS) para formato de resposta da API"""
+    (user_id, name, email, username, cpf, role, phone,
+     is_active, bank_name, bank_agency, bank_account) = _user_fields(user)
+    return {
+        "id": user_id,
+        "nome": name,
+        "email": email,
+        "username": username,
+        "cpf": cpf,
+        "papel": role.value,
+        "telefone": phone,
+        "status": "ATIVO" if is_active else "INATIVO",
+        "dadosBancarios": {
+            "banco": bank_name or "",
+            "agencia": bank_agency or "",
+            "conta": bank_account or ""
+        }
+    }
+
+
+def benefit_to_response(benefit) -> dict:
+    """Converte Benefit (ou Row com BENEFIT_RESPONSE_COLUMNS) para formato de resposta da API"""
+    benefit_id, user_id, name, category, status, value, description = _benefit_fields(benefit)
+    return {
+        "id": benefit_id,
+        "userId": user_id,
+        "nome": name,
+        "categoria": category,
+        "status": status,
+        "valor": value or "",
+        "descricao": description or ""
+    }
+
+
+def message_to_response(message: Message) -> dict:
+    """Converte Message model para formato de resposta da API"""
+    message_id, user_id, title, content, status, created_at = _message_fields(message)
+    return {
+        "id": message_id,
+        "userId": user_id,
+        "titulo": title,
+        "conteudo": content,
+        "status": status,
+        "dataHora": created_at.isoformat()
+    }
+
+
+def log_to_response(log: LogEvent) -> dict:
+    """Converte LogEvent model para formato de resposta da API"""
+    # log.user já vem carregado quando a consulta usa with_user=True
+    return {
+        "id": log.id,
+        "dataHora": log.created_at.isoformat(),
+        "usuario": log.user.name if log.user else "",
+        "userId": log.user_id,  # Retorna None se não houver user_id
+        "tipoEvento": log.event_type,
+        "descricao": log.description
+    }
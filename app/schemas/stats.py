@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Dict
+from datetime import datetime
+
+
+class MessageStats(BaseModel):
+    total: int
+    pendentes: int
+    porStatus: Dict[str, int]
+
+
+class BenefitStats(BaseModel):
+    total: int
+    ativos: int
+    porStatus: Dict[str, int]
+    ativosPorCategoria: Dict[str, int]
+
+
+class UserStats(BaseModel):
+    total: int
+    ativos: int
+    ativosPorPapel: Dict[str, int]
+
+
+class StatsResponse(BaseModel):
+    mensagens: MessageStats
+    beneficios: BenefitStats
+    usuarios: UserStats
+    geradoEm: datetime
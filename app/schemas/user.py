@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -44,10 +44,31 @@ class UserLogin(BaseModel):
     senha: str
 
 
+class UserImportRow(UserCreate):
+    """Linha do arquivo de importação em massa"""
+    papel: Literal["COLABORADOR", "GESTOR_RH", "ADMIN"] = "COLABORADOR"
+
+
+class UserImportError(BaseModel):
+    linha: int
+    erro: str
+
+
+class UserImportResult(BaseModel):
+    total: int
+    importados: int
+    erros: int
+    detalhesErros: List[UserImportError]
+
+
 class UserRoleUpdate(BaseModel):
     papel: str
 
 
+class UserStatusUpdate(BaseModel):
+    status: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -1,14 +1,21 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.models.benefit import Benefit
+from app.models.message import Message
+from app.models.log_event import LogEvent
+from app.core.security import get_password_hash
 from app.crud.user import user_crud
-from app.crud.benefit import benefit_crud
-from app.crud.message import message_crud
-from app.crud.log_event import log_event_crud
 from datetime import datetime, timedelta
 
 
 def seed_database(db: Session):
-    """Popula o banco com dados iniciais se estiver vazio"""
+    """
+    Popula o banco com dados iniciais se estiver vazio
+
+    Tudo numa única transação, com um INSERT em lote por tabela; senhas
+    repetidas são hasheadas uma vez só.
+    """
     
     # Verificar se já existe algum usuário
     existing_user = db.query(User).first()
@@ -94,11 +101,21 @@ def seed_database(db: Session):
     ]
     
     print("Criando usuários...")
-    users = []
+    password_hashes = {
+        password: get_password_hash(password)
+        for password in {user_data["senha"] for user_data in users_data}
+    }
+    user_rows = [
+        user_crud.user_values(user_data, password_hashes[user_data["senha"]])
+        for user_data in users_data
+    ]
+    # ids na ordem de users_data; os dados abaixo referenciam userId 1..5 por posição
+    user_ids = db.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        user_rows
+    ).all()
     for user_data in users_data:
-        user = user_crud.create(db, user_data)
-        users.append(user)
-        print(f"  - Criado: {user.name} ({user.username})")
+        print(f"  - Criado: {user_data['nome']} ({user_data['username']})")
     
     # ========== BENEFÍCIOS ==========
     benefits_data = [
@@ -128,9 +145,18 @@ def seed_database(db: Session):
     ]
     
     print("Criando benefícios...")
-    for benefit_data in benefits_data:
-        benefit = benefit_crud.create(db, benefit_data)
-        print(f"  - Criado: {benefit.name} para user_id={benefit.user_id}")
+    db.execute(insert(Benefit), [
+        {
+            "user_id": user_ids[benefit_data["userId"] - 1],
+            "name": benefit_data["nome"],
+            "category": benefit_data["categoria"],
+            "status": benefit_data["status"],
+            "value": benefit_data["valor"],
+            "description": benefit_data["descricao"]
+        }
+        for benefit_data in benefits_data
+    ])
+    print(f"  - {len(benefits_data)} benefícios criados")
     
     # ========== MENSAGENS ==========
     messages_data = [
@@ -155,10 +181,16 @@ def seed_database(db: Session):
     ]
     
     print("Criando mensagens...")
-    for msg_data in messages_data:
-        user_id = msg_data.pop("user_id")
-        message = message_crud.create(db, msg_data, user_id)
-        print(f"  - Criada: {message.title} de user_id={message.user_id}")
+    db.execute(insert(Message), [
+        {
+            "user_id": user_ids[msg_data["user_id"] - 1],
+            "title": msg_data["titulo"],
+            "content": msg_data["conteudo"],
+            "status": msg_data["status"]
+        }
+        for msg_data in messages_data
+    ])
+    print(f"  - {len(messages_data)} mensagens criadas")
     
     # ========== LOGS ==========
     logs_data = [
@@ -215,9 +247,16 @@ def seed_database(db: Session):
     ]
     
     print("Criando logs...")
-    for log_data in logs_data:
-        log = log_event_crud.create(db, log_data)
-        print(f"  - Criado: {log.event_type} - {log.description}")
+    db.execute(insert(LogEvent), [
+        {
+            "user_id": user_ids[log_data["user_id"] - 1] if log_data["user_id"] else None,
+            "event_type": log_data["event_type"],
+            "description": log_data["description"]
+        }
+        for log_data in logs_data
+    ])
+    print(f"  - {len(logs_data)} logs criados")
     
+    db.commit()
     print("Seed concluído com sucesso!")
 
@@ -0,0 +1,79 @@
+"""Utilitários compartilhados pelos benchmarks (percentis e arquivo de resultado)"""
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por nearest-rank de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    values = sorted(latencies_ms)
+    return {
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_meta(kind: str, label: Optional[str], **extra) -> dict:
+    return {
+        "kind": kind,
+        "label": label,
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        **extra,
+    }
+
+
+def write_results(meta: dict, results: Dict[str, dict], output: Optional[str]) -> str:
+    """
+    Grava {"meta": ..., "results": {nome: {métrica: valor}}} com chaves
+    ordenadas, para que dois arquivos possam ser comparados com diff ou com
+    benchmarks.compare
+    """
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = "-".join(part for part in (meta["kind"], meta.get("label"), meta.get("commit") or "local") if part)
+        output = os.path.join(RESULTS_DIR, f"{name}.json")
+    else:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    return output
+
+
+def print_table(results: Dict[str, dict], columns: List[str]) -> None:
+    width = max([len(name) for name in results] + [8])
+    print(f"{'':<{width}}  " + "  ".join(f"{column:>12}" for column in columns))
+    for name, metrics in results.items():
+        cells = []
+        for column in columns:
+            value = metrics.get(column)
+            cells.append(f"{value:>12}" if value is not None else f"{'-':>12}")
+        print(f"{name:<{width}}  " + "  ".join(cells))
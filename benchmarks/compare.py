@@ -0,0 +1,76 @@
+"""
+Compara dois resultados de benchmark (load_test ou micro).
+
+Uso:
+    python -m benchmarks.compare benchmarks/results/load-abc123.json benchmarks/results/load-def456.json
+
+Mostra, para cada métrica presente nos dois arquivos, o valor base, o novo
+e a variação. Variações piores que --threshold (%) são marcadas como
+regressão e o comando sai com código 1 (útil em CI).
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+# Métricas em que maior é melhor; as demais (latência, tempo, memória) são o contrário
+HIGHER_IS_BETTER = ("rps", "rows_per_s")
+COMPARED_SUFFIXES = ("_ms", "_us", "_kib", "seconds", "rps", "rows_per_s")
+# Uma única requisição lenta muda o máximo: ruidoso demais para comparar
+IGNORED = ("max_ms",)
+
+
+def change(base: float, new: float) -> Optional[float]:
+    if not base:
+        return None
+    return (new - base) / base * 100
+
+
+def is_regression(metric: str, pct: float, threshold: float) -> bool:
+    if metric in HIGHER_IS_BETTER:
+        return pct < -threshold
+    return pct > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois arquivos de resultado de benchmark")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10, help="variação (%%) considerada regressão")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"base: {base['meta'].get('commit')} ({base['meta'].get('label') or '-'})  "
+          f"novo: {new['meta'].get('commit')} ({new['meta'].get('label') or '-'})")
+    regressions = []
+    for name in base["results"]:
+        if name not in new["results"]:
+            print(f"{name}: ausente no novo resultado")
+            continue
+        for metric, base_value in base["results"][name].items():
+            new_value = new["results"][name].get(metric)
+            if metric in IGNORED or not metric.endswith(COMPARED_SUFFIXES) or not isinstance(new_value, (int, float)):
+                continue
+            pct = change(base_value, new_value)
+            mark = ""
+            if pct is not None and is_regression(metric, pct, args.threshold):
+                mark = "  << regressão"
+                regressions.append(f"{name}.{metric}")
+            pct_text = f"{pct:+.1f}%" if pct is not None else "n/a"
+            print(f"{name:<28} {metric:<12} {base_value:>12} {new_value:>12} {pct_text:>9}{mark}")
+        errors = new["results"][name].get("errors")
+        if errors:
+            print(f"{name:<28} {'errors':<12} {base['results'][name].get('errors', 0):>12} {errors:>12}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressões acima de {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNenhuma regressão acima de {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Teste de carga HTTP das rotas da API.
+
+Uso (com a API rodando e o banco populado por app.seed / app.generate_data):
+    python -m benchmarks.load_test --base-url http://localhost:8000 --concurrency 20 --duration 15
+
+Cada cenário roda por --duration segundos (ou --requests requisições) com
+--concurrency workers, cada um com sua conexão keep-alive. As requisições
+do aquecimento (--warmup) não entram nas métricas. O resultado por rota
+(req/s, p50/p95/p99, erros) é gravado em JSON em benchmarks/results/; dois
+arquivos são comparados com benchmarks.compare.
+
+Só usa a biblioteca padrão. Os workers são threads: com concorrência alta o
+próprio cliente pode virar o gargalo, então rode-o em outra máquina (ou
+várias instâncias) ao medir o limite do servidor.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from benchmarks.common import build_meta, latency_summary, print_table, write_results
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    token: Optional[str] = None  # "admin", "user" ou None
+    body: Optional[dict] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    expected: Tuple[int, ...] = (200,)
+
+
+class HttpClient:
+    """Conexão keep-alive de um worker (reconecta se o servidor fechar)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                self._conn.request(method, self.prefix + path, body=body, headers=headers or {})
+                response = self._conn.getresponse()
+                return response.status, response.headers, response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Conexão keep-alive fechada pelo servidor: tenta uma vez numa nova
+                self.close()
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _headers(scenario: Scenario, tokens: Dict[str, str]) -> Dict[str, str]:
+    headers = {"Accept": "application/json", **scenario.headers}
+    if scenario.token:
+        headers["Authorization"] = f"Bearer {tokens[scenario.token]}"
+    if scenario.body is not None:
+        headers["Content-Type"] = "application/json"
+    return headers
+
+
+def run_scenario(
+    scenario: Scenario,
+    tokens: Dict[str, str],
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    max_requests: Optional[int] = None,
+    timeout: float = 30.0,
+) -> dict:
+    headers = _headers(scenario, tokens)
+    body = json.dumps(scenario.body).encode("utf-8") if scenario.body is not None else None
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def worker() -> None:
+        nonlocal errors
+        client = HttpClient(base_url, timeout)
+        local_latencies = []
+        local_statuses: Dict[str, int] = {}
+        local_errors = 0
+        try:
+            while True:
+                now = time.perf_counter()
+                if max_requests is None:
+                    if now >= deadline:
+                        break
+                elif now >= measure_from and next(counter) >= max_requests:
+                    break
+                try:
+                    status, _, _ = client.request(scenario.method, scenario.path, body, headers)
+                    key = str(status)
+                except (OSError, http.client.HTTPException) as e:
+                    status, key = None, type(e).__name__
+                    client.close()
+                end = time.perf_counter()
+                if now < measure_from:
+                    continue
+                local_latencies.append((end - now) * 1000)
+                local_statuses[key] = local_statuses.get(key, 0) + 1
+                if status not in scenario.expected:
+                    local_errors += 1
+        finally:
+            client.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for key, count in local_statuses.items():
+                statuses[key] = statuses.get(key, 0) + count
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(time.perf_counter() - measure_from, 1e-9)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2),
+        "statuses": statuses,
+        **latency_summary(latencies),
+    }
+
+
+def login(client: HttpClient, username: str, password: str) -> str:
+    status, _, body = client.request(
+        "POST", "/api/auth/login",
+        json.dumps({"username": username, "senha": password}).encode("utf-8"),
+        {"Content-Type": "application/json"},
+    )
+    if status != 200:
+        sys.exit(f"Login de '{username}' falhou ({status}): {body[:200].decode('utf-8', 'replace')}")
+    return json.loads(body)["access_token"]
+
+
+def walk_cursor(client: HttpClient, token: str, path: str, pages: int) -> Tuple[Optional[str], int]:
+    """Segue X-Next-Cursor por até `pages` páginas; retorna o cursor alcançado e a profundidade"""
+    cursor, depth = None, 0
+    headers = {"Authorization": f"Bearer {token}"}
+    while depth < pages:
+        separator = "&" if "?" in path else "?"
+        url = path if cursor is None else f"{path}{separator}cursor={quote(cursor)}"
+        status, response_headers, _ = client.request("GET", url, headers=headers)
+        next_cursor = response_headers.get("X-Next-Cursor")
+        if status != 200 or not next_cursor:
+            break
+        cursor, depth = next_cursor, depth + 1
+    return cursor, depth
+
+
+def build_scenarios(client: HttpClient, tokens: Dict[str, str], args) -> Tuple[List[Scenario], dict]:
+    search = quote(args.search)
+    scenarios = [
+        Scenario("auth_login", "POST", "/api/auth/login", body={"username": args.user, "senha": args.password}),
+        Scenario("users_me", "GET", "/api/users/me", "user"),
+        Scenario("users_list", "GET", "/api/users?limit=100", "admin"),
+        Scenario("users_list_role", "GET", "/api/users?limit=100&role=COLABORADOR&is_active=true", "admin"),
+        Scenario("users_search", "GET", f"/api/users?limit=20&search={search}", "admin"),
+        Scenario("benefits_list", "GET", "/api/benefits?limit=100", "admin"),
+        Scenario("benefits_list_category", "GET", "/api/benefits?limit=100&category=SAUDE&status=ATIVO", "admin"),
+        Scenario("benefits_mine", "GET", "/api/benefits", "user"),
+        Scenario("messages_list", "GET", "/api/messages?limit=100&status=PENDENTE", "admin"),
+        Scenario("messages_create", "POST", "/api/messages", "user",
+                 body={"titulo": "Teste de carga", "conteudo": "Mensagem criada pelo benchmark"}, expected=(201,)),
+        Scenario("logs_list", "GET", "/api/logs?limit=100", "admin"),
+        Scenario("logs_list_filtered", "GET", "/api/logs?limit=100&event_type=LOGIN", "admin"),
+        Scenario("stats", "GET", "/api/stats", "admin"),
+    ]
+
+    # Revalidação com ETag: mesmo GET com If-None-Match, resposta 304 sem corpo
+    status, headers, _ = client.request("GET", "/api/benefits", headers={"Authorization": f"Bearer {tokens['user']}"})
+    if status == 200 and headers.get("ETag"):
+        scenarios.append(Scenario("benefits_mine_304", "GET", "/api/benefits", "user",
+                                  headers={"If-None-Match": headers["ETag"]}, expected=(304,)))
+
+    # Página profunda: cursor (seek) x skip (offset) na mesma posição
+    cursor, depth = walk_cursor(client, tokens["admin"], "/api/logs?limit=100", args.deep_pages)
+    if cursor:
+        scenarios.append(Scenario("logs_deep_cursor", "GET", f"/api/logs?limit=100&cursor={quote(cursor)}", "admin"))
+        scenarios.append(Scenario("logs_deep_offset", "GET", f"/api/logs?limit=100&skip={depth * 100}", "admin"))
+
+    return scenarios, {"deep_pages": depth}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP das rotas da API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=10, help="workers simultâneos por cenário")
+    parser.add_argument("--duration", type=float, default=10, help="segundos medidos por cenário")
+    parser.add_argument("--warmup", type=float, default=2, help="segundos de aquecimento (não medidos)")
+    parser.add_argument("--requests", type=int, default=None, help="número fixo de requisições (em vez de --duration)")
+    parser.add_argument("--scenarios", default=None, help="cenários separados por vírgula (padrão: todos)")
+    parser.add_argument("--list", action="store_true", help="lista os cenários e sai")
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--user", default="maria", help="usuário COLABORADOR (login e rotas próprias)")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--search", default="silva", help="termo de busca de users_search")
+    parser.add_argument("--deep-pages", type=int, default=50, help="profundidade (páginas de 100) de logs_deep_*")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--label", default=None, help="rótulo do resultado (ex.: sync, async)")
+    parser.add_argument("--output", default=None, help="arquivo JSON (padrão: benchmarks/results/)")
+    args = parser.parse_args()
+
+    client = HttpClient(args.base_url, args.timeout)
+    tokens = {
+        "admin": login(client, args.admin_user, args.admin_password),
+        "user": login(client, args.user, args.password),
+    }
+    scenarios, setup = build_scenarios(client, tokens, args)
+    client.close()
+
+    if args.list:
+        for scenario in scenarios:
+            print(f"{scenario.name:<24} {scenario.method:<5} {scenario.path}")
+        return
+    if args.scenarios:
+        wanted = {name.strip() for name in args.scenarios.split(",")}
+        unknown = wanted - {scenario.name for scenario in scenarios}
+        if unknown:
+            sys.exit(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+
+    results = {}
+    for scenario in scenarios:
+        print(f"[load] {scenario.name}...", flush=True)
+        results[scenario.name] = run_scenario(
+            scenario, tokens, args.base_url, args.concurrency, args.duration, args.warmup,
+            args.requests, args.timeout,
+        )
+
+    print()
+    print_table(results, ["requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"])
+    meta = build_meta(
+        "load", args.label,
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        duration=args.duration if args.requests is None else None,
+        requests=args.requests,
+        warmup=args.warmup,
+        **setup,
+    )
+    print(f"\nResultado gravado em {write_results(meta, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
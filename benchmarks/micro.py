@@ -0,0 +1,207 @@
+"""
+Micro-benchmarks em processo, direto sobre o banco configurado (DATABASE_URL).
+
+Uso:
+    python -m benchmarks.micro                      # todos os grupos
+    python -m benchmarks.micro --only serializers   # só leitura
+    python -m benchmarks.micro --bulk-users 2000 --import-rows 5000
+
+Grupos:
+- serializers: uma página de 100 linhas de cada lista (users, benefits,
+  messages, logs) serializada pelo caminho atual (mapper + orjson) e pelo
+  caminho padrão do FastAPI (validação pelo response_model +
+  jsonable_encoder + JSONResponse): tempo por página e pico de memória
+- bulk: benefícios concedidos/alterados com um INSERT ... SELECT / UPDATE
+  únicos x um create/commit por usuário (como faria um loop de requisições)
+- import: vazão (linhas/s) do UserImporter com um CSV gerado em memória
+
+bulk e import gravam no banco e removem o que criaram ao final; use um
+banco de benchmark populado por app.generate_data.
+"""
+import argparse
+import csv
+import io
+import time
+import timeit
+import tracemalloc
+import uuid
+from typing import Callable, Dict, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.responses import json_response
+from app.crud.benefit import benefit_crud
+from app.crud.log_event import log_event_crud
+from app.crud.message import message_crud
+from app.crud.user import user_crud
+from app.crud.user_import import UserImporter
+from app.models.benefit import Benefit
+from app.models.user import User
+from app.schemas.benefit import BenefitResponse
+from app.schemas.log_event import LogEventResponse
+from app.schemas.message import MessageResponse
+from app.schemas.serializers import benefit_to_response, log_to_response, message_to_response, user_to_response
+from app.schemas.user import UserResponse
+from benchmarks.common import build_meta, print_table, write_results
+
+GROUPS = ("serializers", "bulk", "import")
+
+
+def _measure(render: Callable[[], object], number: int) -> dict:
+    """Tempo médio por chamada (melhor de 5 repetições) e pico de memória de uma chamada"""
+    per_call = min(timeit.repeat(render, number=number, repeat=5)) / number
+    tracemalloc.start()
+    try:
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"per_page_us": round(per_call * 1e6, 1), "peak_kib": round(peak / 1024, 1)}
+
+
+def bench_serializers(db: Session, number: int) -> Dict[str, dict]:
+    pages = {
+        "users": (user_crud.get_multi(db, limit=100), user_to_response, UserResponse),
+        "benefits": (benefit_crud.get_multi(db, limit=100), benefit_to_response, BenefitResponse),
+        "messages": (message_crud.get_multi(db, limit=100), message_to_response, MessageResponse),
+        "logs": (log_event_crud.get_multi(db, limit=100, with_user=True), log_to_response, LogEventResponse),
+    }
+    results = {}
+    for name, (rows, mapper, model) in pages.items():
+        adapter = TypeAdapter(List[model])
+
+        def orjson_path():
+            return json_response([mapper(row) for row in rows]).body
+
+        def pydantic_path():
+            # O que o FastAPI faz com o response_model quando a rota retorna dados
+            validated = adapter.validate_python([mapper(row) for row in rows])
+            return JSONResponse(jsonable_encoder(validated)).body
+
+        size = len(orjson_path())
+        results[f"serialize_{name}_orjson"] = {"rows": len(rows), "bytes": size, **_measure(orjson_path, number)}
+        results[f"serialize_{name}_pydantic"] = {"rows": len(rows), "bytes": size, **_measure(pydantic_path, number)}
+    return results
+
+
+def _timed(name: str, action: Callable[[], int]) -> dict:
+    started = time.perf_counter()
+    rows = action()
+    seconds = time.perf_counter() - started
+    print(f"  - {name}: {rows} linhas em {seconds:.2f}s")
+    return {"rows": rows, "seconds": round(seconds, 4), "rows_per_s": round(rows / max(seconds, 1e-9), 1)}
+
+
+def bench_bulk(db: Session, users: int) -> Dict[str, dict]:
+    user_ids = db.scalars(
+        select(User.id).where(User.is_active.is_(True)).order_by(User.id).limit(users)
+    ).all()
+    tag = uuid.uuid4().hex[:6]
+    loop_name, bulk_name = f"Benchmark loop {tag}", f"Benchmark bulk {tag}"
+    benefit = {"categoria": "OUTROS", "status": "ATIVO", "valor": "R$ 1,00", "descricao": "benchmark"}
+    results = {}
+    try:
+        created: List[int] = []
+
+        def assign_loop() -> int:
+            # Um commit por benefício, como N requisições separadas
+            for user_id in user_ids:
+                created.append(benefit_crud.create(db, {**benefit, "nome": loop_name, "userId": user_id}).id)
+                db.commit()
+            return len(created)
+
+        def assign_bulk() -> int:
+            rows = benefit_crud.bulk_assign(db, {**benefit, "nome": bulk_name}, user_ids=user_ids)
+            db.commit()
+            return rows
+
+        def status_bulk() -> int:
+            rows = benefit_crud.bulk_update_status(db, "SUSPENSO", name=bulk_name)
+            db.commit()
+            return rows
+
+        def status_loop() -> int:
+            for benefit_id in created:
+                row = benefit_crud.get_by_id(db, benefit_id)
+                row.status = "SUSPENSO"
+                db.commit()
+            return len(created)
+
+        results["benefits_assign_loop"] = _timed("benefits_assign_loop", assign_loop)
+        results["benefits_assign_bulk"] = _timed("benefits_assign_bulk", assign_bulk)
+        results["benefits_status_loop"] = _timed("benefits_status_loop", status_loop)
+        results["benefits_status_bulk"] = _timed("benefits_status_bulk", status_bulk)
+    finally:
+        db.rollback()
+        db.execute(delete(Benefit).where(Benefit.name.in_([loop_name, bulk_name])))
+        db.commit()
+    return results
+
+
+def bench_import(db: Session, rows: int) -> Dict[str, dict]:
+    prefix = f"imp{uuid.uuid4().hex[:6]}"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["nome", "email", "username", "cpf", "telefone", "senha", "papel"])
+    for i in range(rows):
+        username = f"{prefix}.{i}"
+        writer.writerow([f"Usuário {i}", f"{username}@exemplo.com.br", username, f"{i:011d}", "(11) 90000-0000", "123456", "COLABORADOR"])
+    data = io.BytesIO(buffer.getvalue().encode("utf-8"))
+    importer = UserImporter(chunk_size=settings.IMPORT_CHUNK_SIZE)
+    try:
+        return {"import_users_csv": _timed("import_users_csv", lambda: importer.run(db, data, "csv")["importados"])}
+    finally:
+        db.rollback()
+        db.execute(delete(User).where(User.username.like(f"{prefix}.%")))
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de serialização, operações em massa e importação")
+    parser.add_argument("--only", default=None, help=f"grupos separados por vírgula: {', '.join(GROUPS)}")
+    parser.add_argument("--number", type=int, default=200, help="chamadas por repetição nos serializers")
+    parser.add_argument("--bulk-users", type=int, default=1000, help="usuários usados no grupo bulk")
+    parser.add_argument("--import-rows", type=int, default=500, help="linhas do CSV do grupo import")
+    parser.add_argument("--label", default=None, help="rótulo do resultado")
+    parser.add_argument("--output", default=None, help="arquivo JSON (padrão: benchmarks/results/)")
+    args = parser.parse_args()
+
+    groups = [group.strip() for group in args.only.split(",")] if args.only else list(GROUPS)
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"grupos desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = {}
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect.name
+        if "serializers" in groups:
+            print("[micro] serializers...", flush=True)
+            results.update(bench_serializers(db, args.number))
+        if "bulk" in groups:
+            print("[micro] bulk...", flush=True)
+            results.update(bench_bulk(db, args.bulk_users))
+        if "import" in groups:
+            print("[micro] import...", flush=True)
+            results.update(bench_import(db, args.import_rows))
+    finally:
+        db.close()
+
+    print()
+    print_table(results, ["rows", "per_page_us", "peak_kib", "seconds", "rows_per_s"])
+    meta = build_meta(
+        "micro", args.label,
+        database=dialect,
+        groups=groups,
+        bcrypt_rounds=settings.BCRYPT_ROUNDS,
+        import_hash_workers=settings.IMPORT_HASH_WORKERS,
+    )
+    print(f"\nResultado gravado em {write_results(meta, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
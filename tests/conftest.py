@@ -0,0 +1,61 @@
+"""
+Fixtures dos testes: a aplicação roda sobre um SQLite em arquivo temporário,
+recriado e populado pelo seed a cada teste.
+
+As variáveis de ambiente são definidas antes de importar app.*, pois o
+engine e os caches são criados na importação de app.core.database/cache.
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="pbc-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'pbc.db')}"
+os.environ["DB_ASYNC"] = "false"
+os.environ["CORS_ORIGINS"] = "http://localhost"
+os.environ["USER_CACHE_BACKEND"] = "memory"
+os.environ["EVENTS_BACKEND"] = "memory"
+# Custo mínimo do bcrypt: o seed e os logins não dominam o tempo dos testes
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.cache import InMemoryCache, stats_cache, user_cache
+from app.core.database import Base, SessionLocal, engine
+from app.crud.user_search import user_search
+from app.main import app
+from app.seed import seed_database
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Banco recriado com os dados do seed (e a busca FTS5, como no startup); caches zerados"""
+    with engine.begin() as conn:
+        # users_fts não faz parte do metadata: drop_all não a remove
+        conn.exec_driver_sql("DROP TABLE IF EXISTS users_fts")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    assert user_search.setup(engine) == "fts5"
+    session = SessionLocal()
+    try:
+        seed_database(session)
+        monkeypatch.setattr(user_cache, "backend", InMemoryCache())
+        monkeypatch.setattr(stats_cache, "backend", InMemoryCache())
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    # Sem o bloco "with": o startup (init do banco em background) não roda
+    return TestClient(app)
+
+
+@pytest.fixture
+def login(client):
+    """login("maria", "123456") -> headers com o Bearer token"""
+    def _login(username: str, password: str) -> dict:
+        response = client.post("/api/auth/login", json={"username": username, "senha": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from app.core.audit import AuditLogWriter
+
+
+def test_arecord_waits_for_a_full_queue_off_the_event_loop(monkeypatch):
+    writer = AuditLogWriter(max_queue_size=1, enqueue_timeout=0.2)
+    # Sem thread de gravação: a fila continua cheia
+    monkeypatch.setattr(writer, "_ensure_started", lambda: True)
+    assert writer.record("LOGIN", "primeiro") is True
+
+    async def scenario():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        accepted = await writer.arecord("LOGIN", "segundo")
+        waited = time.perf_counter() - started
+        done.set()
+        await tick
+        return accepted, waited, max(gaps)
+
+    accepted, waited, max_gap = asyncio.run(scenario())
+    assert accepted is False
+    assert waited >= 0.2
+    assert max_gap < 0.1
+    assert writer.queue_size() == 1
+
+
+def test_record_after_stop_does_not_restart_the_writer(db):
+    writer = AuditLogWriter(flush_interval=0.01)
+    writer.start()
+    assert writer.record("LOGIN", "antes do stop") is True
+    writer.stop()
+
+    assert writer.record("LOGOUT", "depois do stop") is False
+    assert writer._thread is None
@@ -0,0 +1,56 @@
+from sqlalchemy import func, select
+from app.models.benefit import Benefit
+
+
+def _count(db, **filters) -> int:
+    stmt = select(func.count()).select_from(Benefit).filter_by(**filters)
+    return db.scalar(stmt)
+
+
+def test_bulk_assign_skips_users_that_already_have_the_benefit(client, login, db):
+    headers = login("admin", "admin123")
+    payload = {"nome": "Plano de Saúde", "categoria": "SAUDE", "valor": "Cobertura completa"}
+
+    # Maria, Ana e Carlos já têm; Fernanda está inativa: só o João recebe
+    response = client.post("/api/benefits/bulk", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"afetados": 1}
+    assert client.post("/api/benefits/bulk", json=payload, headers=headers).json() == {"afetados": 0}
+
+    for user_id in (1, 2, 3, 4):
+        assert _count(db, user_id=user_id, name="Plano de Saúde") == 1
+    assert _count(db, user_id=5, name="Plano de Saúde") == 0
+
+
+def test_bulk_assign_filters(client, login, db):
+    headers = login("admin", "admin123")
+    payload = {"nome": "Gympass", "categoria": "OUTROS", "userIds": [1, 5], "apenasAtivos": False}
+    assert client.post("/api/benefits/bulk", json=payload, headers=headers).json() == {"afetados": 2}
+
+    payload = {"nome": "Bônus RH", "categoria": "OUTROS", "papel": "GESTOR_RH"}
+    affected = client.post("/api/benefits/bulk", json=payload, headers=headers).json()["afetados"]
+    assert affected == _count(db, name="Bônus RH") > 0
+    assert _count(db, name="Bônus RH", user_id=1) == 0
+
+
+def test_bulk_update_status_only_touches_listed_users(client, login, db):
+    headers = login("admin", "admin123")
+    payload = {"status": "SUSPENSO", "nome": "Vale Refeição", "userIds": [1, 2]}
+
+    response = client.patch("/api/benefits/status", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"afetados": 2}
+    # Já suspensos não são reescritos
+    assert client.patch("/api/benefits/status", json=payload, headers=headers).json() == {"afetados": 0}
+
+    assert _count(db, name="Vale Refeição", status="SUSPENSO") == 3  # Maria, João e Fernanda (seed)
+    assert _count(db, name="Vale Refeição", user_id=3, status="ATIVO") == 1
+    assert _count(db, name="Vale Refeição", user_id=4, status="ATIVO") == 1
+    assert _count(db, user_id=1, status="SUSPENSO") == 1
+
+
+def test_bulk_routes_require_rh_and_a_filter(client, login):
+    maria = login("maria", "123456")
+    assert client.post("/api/benefits/bulk", json={"nome": "X", "categoria": "OUTROS"}, headers=maria).status_code == 403
+    admin = login("admin", "admin123")
+    assert client.patch("/api/benefits/status", json={"status": "ATIVO"}, headers=admin).status_code == 400
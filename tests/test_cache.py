@@ -0,0 +1,65 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core import database
+from app.core.cache import RedisCache, stats_cache, user_cache
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class FakeRedis:
+    """get/setex/delete como o redis-py, anotando se foi chamado no event loop"""
+
+    def __init__(self):
+        self.data = {}
+        self.calls_on_loop = []
+
+    def get(self, key):
+        self.calls_on_loop.append(_on_event_loop())
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.calls_on_loop.append(_on_event_loop())
+        self.data[key] = value
+
+    def delete(self, key):
+        self.calls_on_loop.append(_on_event_loop())
+        self.data.pop(key, None)
+
+
+def test_redis_cache_is_called_off_the_event_loop(client, login, monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(user_cache, "backend", RedisCache(redis))
+    monkeypatch.setattr(stats_cache, "backend", RedisCache(redis))
+    headers = login("admin", "admin123")
+
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    assert client.get("/api/stats", headers=headers).status_code == 200
+    assert client.get("/api/stats", headers=headers).status_code == 200
+
+    assert "pbc:user:3" in redis.data and "pbc:stats:summary" in redis.data
+    assert redis.calls_on_loop and not any(redis.calls_on_loop)
+
+
+def test_async_session_runs_after_commit_callbacks_off_the_loop(db, monkeypatch):
+    async_engine = create_async_engine(database.engine.url.set(drivername="sqlite+aiosqlite"))
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+    ran_on_loop = []
+
+    async def request():
+        dependency = database.get_db()
+        session = await dependency.__anext__()
+        database.after_commit(session, lambda: ran_on_loop.append(_on_event_loop()))
+        try:
+            await dependency.__anext__()
+        except StopAsyncIteration:
+            pass
+        await async_engine.dispose()
+
+    asyncio.run(request())
+    assert ran_on_loop == [False]
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from app.api.routes.events import event_stream
+from app.core.config import settings
+from app.core.events import event_broker
+
+
+class FakeRequest:
+    """Só o que event_stream usa de Request"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.fixture(autouse=True)
+def fast_heartbeat(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SECONDS", 0.01)
+
+
+def test_disconnect_unsubscribes():
+    async def scenario():
+        request = FakeRequest()
+        stream = event_stream(1, request)
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        assert event_broker.subscriber_count() == 1
+        assert await stream.__anext__() == ": ping\n\n"
+
+        request.disconnected = True
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert event_broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_event_delivered_while_connected():
+    async def scenario():
+        request = FakeRequest()
+        stream = event_stream(7, request)
+        await stream.__anext__()
+        event_broker.publish(7, {"tipo": "MESSAGE_CREATED", "id": 3})
+        chunk = await stream.__anext__()
+        while chunk == ": ping\n\n":
+            chunk = await stream.__anext__()
+        assert chunk.startswith("event: MESSAGE_CREATED\ndata: ")
+        await stream.aclose()
+        assert event_broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
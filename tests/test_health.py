@@ -0,0 +1,25 @@
+from app.core import database
+from app.core.health import db_init_state
+
+IDLE = {"size": 5, "checked_out": 0, "checked_in": 5, "overflow": 0, "max_overflow": 10}
+EXHAUSTED = {"size": 5, "checked_out": 15, "checked_in": 0, "overflow": 10, "max_overflow": 10}
+
+
+def test_ready_when_routes_pool_is_free(client, monkeypatch):
+    monkeypatch.setattr(db_init_state, "status", "done")
+    response = client.get("/ready")
+    assert response.status_code == 200, response.text
+    assert response.json()["checks"]["pool"]["engine"] == "sync"
+    assert response.json()["checks"]["database"]["ok"] is True
+
+
+def test_not_ready_when_async_pool_is_exhausted(client, monkeypatch):
+    monkeypatch.setattr(db_init_state, "status", "done")
+    # DB_ASYNC=true: as rotas usam o pool do engine assíncrono, o síncrono fica ocioso
+    monkeypatch.setattr(database, "async_engine", object())
+    monkeypatch.setattr(database, "pool_status", lambda: {"sync": IDLE, "async": EXHAUSTED})
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    pool = response.json()["checks"]["pool"]
+    assert pool == {"ok": False, "engine": "async", "saturation": 1.0}
@@ -0,0 +1,84 @@
+"""
+As listagens (get_multi) usam os índices compostos para cada combinação de
+filtro/ordenação: EXPLAIN QUERY PLAN da consulta gerada no SQLite.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.core.database import engine
+from app.core.pagination import encode_cursor
+from app.crud.benefit import benefit_crud
+from app.crud.log_event import log_event_crud
+from app.crud.message import message_crud
+
+LOG_CURSOR = encode_cursor(10, datetime(2026, 1, 1))
+
+# (tabela, índice esperado, consulta, índice também dá a ordem)
+SHAPES = {
+    "logs": ("log_events", "ix_log_events_created_at_id",
+             lambda db: log_event_crud.get_multi(db, with_user=True), True),
+    "logs_user": ("log_events", "ix_log_events_user_id_created_at",
+                  lambda db: log_event_crud.get_multi(db, user_id=1, with_user=True), True),
+    "logs_event_type": ("log_events", "ix_log_events_event_type_created_at",
+                        lambda db: log_event_crud.get_multi(db, event_type="LOGIN", with_user=True), True),
+    "logs_dates": ("log_events", "ix_log_events_created_at_id",
+                   lambda db: log_event_crud.get_multi(
+                       db, start_date=datetime(2026, 1, 1), end_date=datetime(2026, 2, 1), with_user=True), True),
+    "logs_cursor": ("log_events", "ix_log_events_created_at_id",
+                    lambda db: log_event_crud.get_multi(db, cursor=LOG_CURSOR, with_user=True), True),
+    "logs_event_type_cursor": ("log_events", "ix_log_events_event_type_created_at",
+                               lambda db: log_event_crud.get_multi(
+                                   db, event_type="LOGIN", cursor=LOG_CURSOR, with_user=True), True),
+    "messages": ("messages", "ix_messages_created_at_id",
+                 lambda db: message_crud.get_multi(db), True),
+    "messages_user": ("messages", "ix_messages_user_id_created_at",
+                      lambda db: message_crud.get_multi(db, user_id=1), True),
+    "messages_status": ("messages", "ix_messages_status_created_at",
+                        lambda db: message_crud.get_multi(db, status="PENDENTE"), True),
+    "messages_status_cursor": ("messages", "ix_messages_status_created_at",
+                               lambda db: message_crud.get_multi(db, status="PENDENTE", cursor=LOG_CURSOR), True),
+    "benefits_user": ("benefits", "ix_benefits_user_id",
+                      lambda db: benefit_crud.get_multi(db, user_id=1), True),
+    "benefits_category": ("benefits", "ix_benefits_category_status",
+                          lambda db: benefit_crud.get_multi(db, category="SAUDE"), False),
+    "benefits_category_status": ("benefits", "ix_benefits_category_status",
+                                 lambda db: benefit_crud.get_multi(db, category="SAUDE", status="ATIVO"), True),
+    "benefits_status": ("benefits", "ix_benefits_status",
+                        lambda db: benefit_crud.get_multi(db, status="ATIVO"), True),
+}
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(db, run) -> list:
+    """Linhas do EXPLAIN QUERY PLAN do SELECT executado por run(db)"""
+    with captured_selects() as statements:
+        run(db)
+    (statement, parameters), = statements
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+
+@pytest.mark.parametrize("shape", list(SHAPES))
+def test_get_multi_uses_index(db, shape):
+    table, index, run, ordered = SHAPES[shape]
+    plan = query_plan(db, run)
+    table_steps = [step for step in plan if step.startswith((f"SCAN {table}", f"SEARCH {table}"))]
+
+    assert table_steps and all(f"USING INDEX {index}" in step for step in table_steps), plan
+    if ordered:
+        assert not any("TEMP B-TREE" in step for step in plan), plan
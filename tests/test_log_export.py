@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from app.core.database import SessionLocal
+from app.crud.log_export import CSV_HEADER, log_exporter
+
+
+class TrackingSessionFactory:
+    """Registra as sessões abertas pela exportação para conferir o close()"""
+
+    def __init__(self):
+        self.sessions = []
+        self.closed = 0
+
+    def __call__(self):
+        session = SessionLocal()
+        original_close = session.close
+
+        def close():
+            self.closed += 1
+            original_close()
+
+        session.close = close
+        self.sessions.append(session)
+        return session
+
+
+def test_export_csv_streams_filtered_rows_and_closes_its_session(client, login, db, monkeypatch):
+    factory = TrackingSessionFactory()
+    monkeypatch.setattr(log_exporter, "session_factory", factory)
+    # Lotes pequenos: a resposta sai em vários blocos
+    monkeypatch.setattr(log_exporter, "batch_size", 2)
+    headers = login("admin", "admin123")
+
+    response = client.get("/api/logs/export", params={"user_id": 1}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="logs.csv"' in response.headers["content-disposition"]
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert tuple(rows[0]) == CSV_HEADER
+    assert [row[4] for row in rows[1:]] == ["LOGIN", "UPDATE_DATA", "NEW_MESSAGE", "NEW_MESSAGE"]
+    assert {row[2] for row in rows[1:]} == {"1"}
+    assert {row[3] for row in rows[1:]} == {"Maria Santos"}
+    ids = [int(row[0]) for row in rows[1:]]
+    assert ids == sorted(ids)
+
+    assert len(factory.sessions) == 1
+    assert factory.closed == 1
+
+
+def test_export_ndjson_applies_event_type_filter(client, login, db, monkeypatch):
+    factory = TrackingSessionFactory()
+    monkeypatch.setattr(log_exporter, "session_factory", factory)
+    headers = login("admin", "admin123")
+
+    response = client.get(
+        "/api/logs/export",
+        params={"formato": "ndjson", "event_type": "NEW_MESSAGE"},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["userId"] for line in lines] == [1, 1, 4]
+    assert all(line["tipoEvento"] == "NEW_MESSAGE" for line in lines)
+    assert lines[-1]["usuario"] == "Carlos Oliveira"
+    assert factory.closed == 1
+
+
+def test_export_rejects_unknown_format_and_non_rh(client, login):
+    admin = login("admin", "admin123")
+    assert client.get("/api/logs/export", params={"formato": "xml"}, headers=admin).status_code == 400
+    maria = login("maria", "123456")
+    assert client.get("/api/logs/export", headers=maria).status_code == 403
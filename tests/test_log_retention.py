@@ -0,0 +1,172 @@
+import gzip
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import delete, func, insert, select
+from app.core.database import engine
+from app.core.log_retention import DEFAULT_PARTITION, LogRetention
+from app.models.log_event import LogEvent
+
+NOW = datetime(2026, 10, 18)
+
+
+def _add_logs(db, *dates: datetime) -> None:
+    db.execute(insert(LogEvent), [
+        {"user_id": None, "event_type": "LOGIN", "description": f"Login {date:%Y-%m-%d}", "created_at": date}
+        for date in dates
+    ])
+    db.commit()
+
+
+def test_run_archives_and_deletes_expired_months(db, tmp_path):
+    db.execute(delete(LogEvent))
+    _add_logs(db, datetime(2025, 8, 3), datetime(2025, 8, 20), datetime(2025, 9, 1), datetime(2025, 10, 1), NOW)
+    retention = LogRetention(engine=engine, archive_dir=str(tmp_path), retention_months=12)
+
+    planned = retention.run(dry_run=True, now=NOW)
+    assert [item["mes"] for item in planned] == ["2025-08", "2025-09"]
+    assert db.scalar(select(func.count()).select_from(LogEvent)) == 5
+
+    results = retention.run(now=NOW)
+    assert [(item["mes"], item["linhas"]) for item in results] == [("2025-08", 2), ("2025-09", 1)]
+    with gzip.open(results[0]["arquivo"], "rt", encoding="utf-8") as f:
+        archived = [json.loads(line) for line in f]
+    assert [row["description"] for row in archived] == ["Login 2025-08-03", "Login 2025-08-20"]
+
+    remaining = db.scalars(select(LogEvent.created_at).order_by(LogEvent.created_at)).all()
+    assert remaining == [datetime(2025, 10, 1), NOW]
+    assert retention.run(now=NOW) == []
+
+
+class FakeResult:
+    def __init__(self, rows=(), scalar=None, rowcount=0):
+        self.rows = list(rows)
+        self._scalar = scalar
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self._scalar
+
+    def scalars(self):
+        return iter(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeConnection:
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.engine.executed.append((sql, params or {}))
+        return self.engine.respond(sql, params or {})
+
+    def execution_options(self, **options):
+        return self
+
+
+class FakePostgres:
+    """
+    Engine falso de um log_events particionado: responde às consultas de
+    catálogo de LogRetention e anota todo o SQL executado
+    """
+
+    def __init__(self, partitions, default_rows=()):
+        self.partitions = partitions
+        self.default_rows = list(default_rows)
+        self.executed = []
+
+    @contextmanager
+    def connect(self):
+        yield FakeConnection(self)
+
+    begin = connect
+
+    def respond(self, sql, params):
+        if "pg_partitioned_table" in sql:
+            return FakeResult(scalar=True)
+        if "pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        if sql.startswith(f"SELECT MIN(created_at) FROM {DEFAULT_PARTITION}"):
+            return FakeResult(scalar=min((d for d in self.default_rows if d < params["cutoff"]), default=None))
+        if sql.startswith(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION}"):
+            return FakeResult(scalar=any(params["start"] <= d < params["end"] for d in self.default_rows))
+        if sql.startswith("SELECT id"):
+            row = {"id": 1, "user_id": None, "event_type": "LOGIN", "description": "Login", "created_at": NOW}
+            return FakeResult([SimpleNamespace(_mapping=row)])
+        if sql.startswith("WITH moved AS"):
+            return FakeResult(rowcount=2)
+        return FakeResult()
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.executed if sql.startswith(prefix)]
+
+
+def test_partitioned_run_drops_expired_partitions_and_cleans_default(tmp_path):
+    engine = FakePostgres(
+        ["log_events_p202508", "log_events_p202509", "log_events_p202510", "log_events_p202611", DEFAULT_PARTITION],
+        default_rows=[datetime(2025, 7, 9), datetime(2026, 10, 2)],
+    )
+    retention = LogRetention(engine=engine, archive_dir=str(tmp_path), retention_months=12)
+
+    results = retention.run(now=NOW)
+
+    assert [(item["mes"], item["linhas"]) for item in results] == [("2025-07", 1), ("2025-08", 1), ("2025-09", 1)]
+    assert [sql for sql, _ in engine.statements("ALTER TABLE log_events DETACH")] == [
+        "ALTER TABLE log_events DETACH PARTITION log_events_p202508",
+        "ALTER TABLE log_events DETACH PARTITION log_events_p202509",
+    ]
+    assert [sql for sql, _ in engine.statements("DROP TABLE")] == [
+        "DROP TABLE log_events_p202508",
+        "DROP TABLE log_events_p202509",
+    ]
+    # Meses sem partição expirados saem da DEFAULT por intervalo; o mês atual fica
+    (sql, params), = engine.statements("DELETE FROM")
+    assert sql.startswith(f"DELETE FROM {DEFAULT_PARTITION} WHERE")
+    assert params == {"start": datetime(2025, 7, 1), "end": datetime(2025, 8, 1)}
+
+
+def test_partitioned_dry_run_changes_nothing(tmp_path):
+    engine = FakePostgres(["log_events_p202508", DEFAULT_PARTITION])
+    retention = LogRetention(engine=engine, archive_dir=str(tmp_path), retention_months=12)
+
+    assert [item["mes"] for item in retention.run(dry_run=True, now=NOW)] == ["2025-08"]
+    assert not engine.statements("ALTER") and not engine.statements("DROP") and not engine.statements("DELETE")
+
+
+def test_ensure_partitions_moves_default_rows_into_new_partition():
+    engine = FakePostgres(["log_events_p202610", DEFAULT_PARTITION], default_rows=[datetime(2026, 11, 5)])
+    retention = LogRetention(engine=engine, months_ahead=2)
+
+    assert retention.ensure_partitions(now=NOW) == ["log_events_p202611", "log_events_p202612"]
+
+    # Novembro tem linhas na DEFAULT: tabela comum + cópia + ATTACH
+    assert engine.statements("CREATE TABLE log_events_p202611 (LIKE log_events")
+    (_, params), = engine.statements(f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION}")
+    assert params == {"start": datetime(2026, 11, 1), "end": datetime(2026, 12, 1)}
+    assert [sql for sql, _ in engine.statements("ALTER TABLE log_events ATTACH")] == [
+        "ALTER TABLE log_events ATTACH PARTITION log_events_p202611 FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')"
+    ]
+    # Dezembro não tem: criada direto como partição
+    assert [sql for sql, _ in engine.statements("CREATE TABLE IF NOT EXISTS")] == [
+        "CREATE TABLE IF NOT EXISTS log_events_p202612 PARTITION OF log_events"
+        " FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    ]
+
+
+def test_partition_maintenance_repeats_ensure_partitions(monkeypatch):
+    retention = LogRetention(engine=FakePostgres([]))
+    calls = threading.Semaphore(0)
+    monkeypatch.setattr(retention, "ensure_partitions", lambda: calls.release() or [])
+
+    retention.start_partition_maintenance(0.01)
+    try:
+        assert calls.acquire(timeout=1) and calls.acquire(timeout=1)
+    finally:
+        retention.stop_partition_maintenance()
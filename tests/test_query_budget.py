@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert
+from app.core.query_stats import query_budget
+from app.models.log_event import LogEvent
+from app.models.user import User
+
+
+def _request_queries(budget) -> int:
+    (_, stats), = budget.requests
+    return stats.count
+
+
+def _add_logs(db, count: int, start: int = 0) -> None:
+    """count logs, cada um de um usuário diferente (um N+1 no usuário apareceria aqui)"""
+    users = [
+        {
+            "name": f"Usuário {i}", "email": f"log{i}@exemplo.com.br", "username": f"log.{i}",
+            "password_hash": "x", "role": "COLABORADOR", "cpf": f"{i:011d}", "phone": "(11) 90000-0000",
+            "is_active": True, "created_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+        }
+        for i in range(start, start + count)
+    ]
+    user_ids = db.scalars(insert(User).returning(User.id), users).all()
+    now = datetime.utcnow()
+    db.execute(insert(LogEvent), [
+        {"user_id": user_id, "event_type": "LOGIN", "description": "Login", "created_at": now - timedelta(seconds=i)}
+        for i, user_id in enumerate(user_ids)
+    ])
+    db.commit()
+
+
+def test_list_logs_query_count_does_not_grow_with_rows(client, login, db):
+    headers = login("admin", "admin123")
+    db.execute(delete(LogEvent))
+    db.commit()
+    # Aquece o cache do usuário autenticado: só as consultas da listagem contam
+    client.get("/api/users/me", headers=headers)
+
+    _add_logs(db, 1)
+    with query_budget(2, max_repeats=1) as budget:
+        response = client.get("/api/logs?limit=100", headers=headers)
+    assert len(response.json()) == 1
+    one_row = _request_queries(budget)
+
+    _add_logs(db, 99, start=1)
+    with query_budget(2, max_repeats=1) as budget:
+        response = client.get("/api/logs?limit=100", headers=headers)
+    assert len(response.json()) == 100
+    assert all(log["usuario"] for log in response.json())
+    assert _request_queries(budget) == one_row
+
+
+def _warm(client, headers: dict) -> dict:
+    # Usuário autenticado já no cache: o orçamento mede só o trabalho da rota
+    client.get("/api/users/me", headers=headers)
+    return headers
+
+
+def test_register_queries(client):
+    # Verificação de conflito + INSERT
+    with query_budget(2, max_repeats=1):
+        response = client.post("/api/auth/register", json={
+            "nome": "Novo Usuário", "email": "novo@exemplo.com.br", "username": "novo",
+            "cpf": "111.222.333-44", "telefone": "(11) 90000-0000", "senha": "123456",
+        })
+    assert response.status_code == 200, response.text
+
+
+def test_update_me_queries(client, login):
+    headers = _warm(client, login("maria", "123456"))
+    # UPDATE ... RETURNING + log de auditoria
+    with query_budget(2, max_repeats=1):
+        response = client.put("/api/users/me", json={"telefone": "(11) 91111-1111"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["telefone"] == "(11) 91111-1111"
+
+
+def test_update_role_queries(client, login):
+    headers = _warm(client, login("admin", "admin123"))
+    # SELECT do usuário (papel antigo no log) + UPDATE + log de auditoria
+    with query_budget(3, max_repeats=1):
+        response = client.patch("/api/users/4/role", json={"papel": "GESTOR_RH"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["papel"] == "GESTOR_RH"
+
+
+def test_create_message_queries(client, login):
+    headers = _warm(client, login("maria", "123456"))
+    # INSERT da mensagem + log de auditoria
+    with query_budget(2, max_repeats=1):
+        response = client.post("/api/messages", json={"titulo": "Dúvida", "conteudo": "Texto"}, headers=headers)
+    assert response.status_code == 201, response.text
+
+
+def test_update_message_status_queries(client, login):
+    headers = _warm(client, login("admin", "admin123"))
+    # UPDATE ... RETURNING
+    with query_budget(1):
+        response = client.patch("/api/messages/1", json={"status": "RESPONDIDA"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "RESPONDIDA"
@@ -0,0 +1,65 @@
+from app.core.cache import stats_cache
+from app.models.message import Message
+
+
+def _stats(client, headers) -> dict:
+    response = client.get("/api/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _add_message_directly(db) -> None:
+    """Escrita fora das rotas: não invalida o cache"""
+    db.add(Message(user_id=4, title="Direto no banco", content="...", status="PENDENTE"))
+    db.commit()
+
+
+def test_stats_counts_match_seed(client, login):
+    stats = _stats(client, login("joao", "123456"))
+
+    assert stats["mensagens"] == {
+        "total": 3,
+        "pendentes": 2,
+        "porStatus": {"PENDENTE": 2, "EM_ANALISE": 1},
+    }
+    assert stats["beneficios"] == {
+        "total": 14,
+        "ativos": 12,
+        "porStatus": {"ATIVO": 12, "SUSPENSO": 2},
+        "ativosPorCategoria": {"ALIMENTACAO": 4, "SAUDE": 4, "OUTROS": 4},
+    }
+    assert stats["usuarios"] == {
+        "total": 5,
+        "ativos": 4,
+        "ativosPorPapel": {"COLABORADOR": 2, "GESTOR_RH": 1, "ADMIN": 1},
+    }
+
+
+def test_stats_served_from_cache_until_a_write_invalidates(client, login, db):
+    headers = login("admin", "admin123")
+    first = _stats(client, headers)
+
+    _add_message_directly(db)
+    assert _stats(client, headers) == first
+
+    # Escrita pela rota: invalida no commit
+    maria = login("maria", "123456")
+    response = client.post("/api/messages", json={"titulo": "Nova", "conteudo": "Olá"}, headers=maria)
+    assert response.status_code == 201, response.text
+    stats = _stats(client, headers)
+    assert stats["mensagens"]["total"] == 5
+    assert stats["mensagens"]["pendentes"] == 4
+    assert stats["geradoEm"] != first["geradoEm"]
+
+
+def test_stats_cache_expires_after_ttl(client, login, db, monkeypatch):
+    monkeypatch.setattr(stats_cache, "ttl", 0)
+    headers = login("admin", "admin123")
+    assert _stats(client, headers)["mensagens"]["total"] == 3
+
+    _add_message_directly(db)
+    assert _stats(client, headers)["mensagens"]["total"] == 4
+
+
+def test_stats_requires_rh(client, login):
+    assert client.get("/api/stats", headers=login("maria", "123456")).status_code == 403
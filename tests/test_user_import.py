@@ -0,0 +1,105 @@
+import asyncio
+import io
+import time
+from app.core import security
+from app.crud.user_import import UserImporter
+from app.models.user import User
+
+CSV_HEADER = "nome,email,username,senha,cpf,telefone,papel\n"
+
+
+def _csv(rows: int, prefix: str = "imp") -> bytes:
+    lines = [
+        f"Usuário {i},{prefix}{i}@exemplo.com.br,{prefix}.{i},123456,{i:011d},(11) 90000-0000,COLABORADOR\n"
+        for i in range(rows)
+    ]
+    return (CSV_HEADER + "".join(lines)).encode("utf-8")
+
+
+def test_import_route_reports_rows(client, login):
+    headers = login("admin", "admin123")
+    data = _csv(3) + b"Sem Email,,semmail,123456,1,(11) 1,COLABORADOR\nRepetido,imp0@exemplo.com.br,outro,123456,1,(11) 1,\n"
+    response = client.post(
+        "/api/users/import",
+        files={"file": ("usuarios.csv", data, "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total"] == 5
+    assert body["importados"] == 3
+    assert [error["linha"] for error in body["detalhesErros"]] == [5, 6]
+
+
+def test_arun_keeps_event_loop_free(db, monkeypatch):
+    # bcrypt lento de propósito: se o hash rodasse no event loop, os ticks atrasariam
+    monkeypatch.setattr(security.pwd_context, "hash", lambda password: time.sleep(0.1) or f"hash:{password}")
+    importer = UserImporter(chunk_size=4)
+
+    async def scenario():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        try:
+            result = await importer.arun(db, io.BytesIO(_csv(12)), "csv")
+        finally:
+            done.set()
+            await tick
+        return result, max(gaps)
+
+    result, max_gap = asyncio.run(scenario())
+    assert result["importados"] == 12
+    assert max_gap < 0.05
+    assert db.query(User).filter(User.username.like("imp.%")).count() == 12
+
+
+def _import(client, headers, data: bytes, filename: str = "usuarios.csv"):
+    return client.post("/api/users/import", files={"file": (filename, data, "text/csv")}, headers=headers)
+
+
+def test_non_utf8_lines_are_reported_per_line(client, login):
+    headers = login("admin", "admin123")
+    data = (
+        CSV_HEADER.encode("utf-8")
+        + "Ana,ana@exemplo.com.br,ana,123456,1,(11) 1,\n".encode("utf-8")
+        + "João Conceição,joao2@exemplo.com.br,joao2,123456,2,(11) 2,\n".encode("cp1252")
+        + "Bia,bia@exemplo.com.br,bia,123456,3,(11) 3,\n".encode("utf-8")
+    )
+    response = _import(client, headers, data)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["importados"] == 2
+    assert [(error["linha"], "UTF-8" in error["erro"]) for error in body["detalhesErros"]] == [(3, True)]
+
+
+def test_non_utf8_header_is_rejected(client, login):
+    headers = login("admin", "admin123")
+    data = "nome,email,username,senha,cpf,telefone,papel,agência\n".encode("cp1252")
+    response = _import(client, headers, data)
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
+
+
+def test_email_conflicts_ignore_case(client, login):
+    headers = login("admin", "admin123")
+    # maria.santos@empresa.com.br já existe (seed)
+    data = (CSV_HEADER + "Maria,Maria.Santos@empresa.com.br,maria2,123456,1,(11) 1,\n").encode("utf-8")
+    body = _import(client, headers, data).json()
+    assert body["importados"] == 0
+    assert body["detalhesErros"] == [{"linha": 2, "erro": "Email já cadastrado"}]
+
+    response = client.post("/api/auth/register", json={
+        "nome": "Maria", "email": "MARIA.SANTOS@empresa.com.br", "username": "maria3",
+        "cpf": "1", "telefone": "1", "senha": "123456",
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email já cadastrado"
@@ -0,0 +1,51 @@
+from sqlalchemy import text
+from app.core.database import engine
+from app.crud.user_search import user_search
+
+
+def _search(client, headers, term: str) -> list:
+    response = client.get("/api/users", params={"search": term}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [user["username"] for user in response.json()]
+
+
+def test_search_ignores_accents_and_case(client, login):
+    headers = login("admin", "admin123")
+    # "João Silva" e "Conceição" no banco; termos sem acento e com maiúsculas
+    response = client.post("/api/auth/register", json={
+        "nome": "Lúcia Conceição", "email": "lucia@exemplo.com.br", "username": "lucia",
+        "cpf": "1", "telefone": "1", "senha": "123456",
+    })
+    assert response.status_code in (200, 201), response.text
+    assert _search(client, headers, "JOAO") == ["joao"]
+    assert _search(client, headers, "conceicao") == ["lucia"]
+    assert _search(client, headers, "Lucía") == ["lucia"]
+
+
+def test_search_orders_by_relevance(client, login):
+    headers = login("admin", "admin123")
+    # "silva" no nome, email e username: mais relevante que João Silva (id menor)
+    response = client.post("/api/auth/register", json={
+        "nome": "Paula Silva", "email": "silva@exemplo.com.br", "username": "silva",
+        "cpf": "1", "telefone": "1", "senha": "123456",
+    })
+    assert response.status_code in (200, 201), response.text
+    assert _search(client, headers, "silva") == ["silva", "joao"]
+
+
+def test_punctuation_only_search_returns_nothing(client, login, monkeypatch):
+    headers = login("admin", "admin123")
+    assert _search(client, headers, "!!! --") == []
+    monkeypatch.setattr(user_search, "backend", "like")
+    assert _search(client, headers, "!!! --") == []
+
+
+def test_setup_rebuilds_index_only_when_created(db):
+    # Um usuário fora do índice: setup de novo não deve refazer o índice inteiro
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO users_fts(users_fts, rowid, name, email, username)"
+                             " SELECT 'delete', id, name, email, username FROM users WHERE username = 'maria'")
+    user_search.setup(engine)
+    with engine.connect() as conn:
+        indexed = conn.execute(text("SELECT count(*) FROM users_fts WHERE users_fts MATCH 'maria'")).scalar()
+    assert indexed == 0
@@ -0,0 +1,22 @@
+def test_deactivation_revokes_cached_user(client, login):
+    admin = login("admin", "admin123")
+    carlos = login("carlos", "123456")
+    carlos_id = client.get("/api/users/me", headers=carlos).json()["id"]
+
+    response = client.patch(f"/api/users/{carlos_id}/status", json={"status": "INATIVO"}, headers=admin)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "INATIVO"
+    # O snapshot em cache foi invalidado no commit: o token já não vale
+    assert client.get("/api/users/me", headers=carlos).status_code == 403
+
+    response = client.patch(f"/api/users/{carlos_id}/status", json={"status": "ATIVO"}, headers=admin)
+    assert response.json()["status"] == "ATIVO"
+    assert client.get("/api/users/me", headers=carlos).status_code == 200
+
+
+def test_status_route_validation(client, login):
+    admin = login("admin", "admin123")
+    assert client.patch("/api/users/4/status", json={"status": "BLOQUEADO"}, headers=admin).status_code == 422
+    assert client.patch("/api/users/999/status", json={"status": "INATIVO"}, headers=admin).status_code == 404
+    maria = login("maria", "123456")
+    assert client.patch("/api/users/4/status", json={"status": "INATIVO"}, headers=maria).status_code == 403